@@ -4,14 +4,105 @@ This file is used to convert the temperature from Fahrenheit to Celsius and vice
 Date: 2025-12-01
 """
 
+import time
+
+import numpy as np
+
+# The message of an invalid temperature input
+INVALID_TEMPERATURE_MESSAGE = "Invalid input. Please enter the temperature with the correct 'C' or F' prefix."
+
+
+class UnitConversionGraph:
+    """
+    This class is used to convert values between any two connected units.
+    Every edge of the graph is an affine transform: to_value = from_value * scale + offset.
+    The transform between two units that are not directly connected is composed
+    along the path between them once, then cached, so every conversion is one
+    multiply and one add, for a single value or a whole numpy array.
+    """
+    def __init__(self):
+        """
+        This method is used to initialize an empty graph.
+        """
+        #unit -> {neighbour unit: (scale, offset)}
+        self._edges = {}
+        #(from unit, to unit) -> composed (scale, offset)
+        self._transforms = {}
+
+    def add_conversion(self, from_unit:str, to_unit:str, scale:float, offset:float=0.0):
+        """
+        This method is used to add a conversion (and its inverse) to the graph.
+        """
+        if scale == 0:
+            raise ValueError("The scale of a conversion can not be 0.")
+        self._edges.setdefault(from_unit, {})[to_unit] = (scale, offset)
+        #the inverse of y = x * scale + offset is x = y / scale - offset / scale
+        self._edges.setdefault(to_unit, {})[from_unit] = (1 / scale, -offset / scale)
+        #a new edge can give shorter paths, so the cached transforms are rebuilt on demand
+        self._transforms.clear()
+
+    @property
+    def units(self):
+        """
+        This property is used to get all the units of the graph.
+        """
+        return sorted(self._edges)
+
+    def get_transform(self, from_unit:str, to_unit:str):
+        """
+        This method is used to get the (scale, offset) from one unit to another.
+        The path is found with a breadth-first search and the transforms of its
+        edges are composed into one, which is cached for the next call.
+        """
+        key = (from_unit, to_unit)
+        if key in self._transforms:
+            return self._transforms[key]
+        if from_unit not in self._edges or to_unit not in self._edges:
+            raise ValueError(f"Unknown unit. Please use one of: {', '.join(self.units)}.")
+        #breadth-first search, every unit keeps the composed transform from from_unit
+        composed = {from_unit: (1.0, 0.0)}
+        queue = [from_unit]
+        for unit in queue:
+            if unit == to_unit:
+                break
+            scale, offset = composed[unit]
+            for neighbour, (edge_scale, edge_offset) in self._edges[unit].items():
+                if neighbour not in composed:
+                    #apply the edge after the path so far: (x * scale + offset) * edge_scale + edge_offset
+                    composed[neighbour] = (scale * edge_scale, offset * edge_scale + edge_offset)
+                    queue.append(neighbour)
+        if to_unit not in composed:
+            raise ValueError(f"There is no conversion from {from_unit} to {to_unit}.")
+        self._transforms[key] = composed[to_unit]
+        return composed[to_unit]
+
+    def convert(self, value, from_unit:str, to_unit:str):
+        """
+        This method is used to convert a value, a list or a numpy array of values.
+        """
+        scale, offset = self.get_transform(from_unit, to_unit)
+        if not np.isscalar(value):
+            value = np.asarray(value, dtype=np.float64)
+        return value * scale + offset
+
+
+#the temperature units: Celsius, Fahrenheit, Kelvin and Rankine
+temperature_graph = UnitConversionGraph()
+temperature_graph.add_conversion('C', 'F', 9/5, 32)
+temperature_graph.add_conversion('C', 'K', 1, 273.15)
+temperature_graph.add_conversion('F', 'R', 1, 459.67)
+
+
 class TemperatureConverter:
     """
     This class is used to convert the temperature from Fahrenheit to Celsius and vice versa.
     """
-    def __init__(self, temperature:str):
+    def __init__(self, temperature:str, verbose:bool=True):
         """
         This method is used to initialize the class.
+        Set verbose to False to skip the console message of the input unit.
         """
+        self.verbose = verbose
         self.original_temperature = temperature.upper()
         self.temperature = temperature.upper()
         #check the temperature
@@ -19,6 +110,7 @@ class TemperatureConverter:
             #Fahrenheit to Celsius
             #if return True, then convert the temperature to Celsius
             self.temperature = float(self.temperature[1:])
+            self.unit = 'F'
             self.converted_temperature = self.convert_to_celsius()
             self.original_temperature += f" degrees Fahrenheit is converted to {self.converted_temperature} degrees Celsius."
             
@@ -26,6 +118,7 @@ class TemperatureConverter:
             #Celsius to Fahrenheit
             #if return False, then convert the temperature to Fahrenheit
             self.temperature = float(self.temperature[1:])
+            self.unit = 'C'
             self.converted_temperature = self.convert_to_fahrenheit()
             self.original_temperature += f" degrees Celsius is converted to {self.converted_temperature} degrees Fahrenheit."
     
@@ -35,19 +128,21 @@ class TemperatureConverter:
         """
         #check if the temperature is a string
         if not isinstance(self.temperature, str) or len(self.temperature) < 2:
-            raise ValueError("Invalid input. Please enter the temperature with the correct 'C' or F' prefix.")
+            raise ValueError(INVALID_TEMPERATURE_MESSAGE)
         #check if the temperature starts with F
         if self.temperature[0] == 'F':
             #print the message
-            print("🔔 Your input is in Fahrenheit! We will convert it to Celsius!")
+            if self.verbose:
+                print("🔔 Your input is in Fahrenheit! We will convert it to Celsius!")
             #return True
             return True
         elif self.temperature[0] == 'C':
-            print("🔔 Your input is in Celsius! We will convert it to Fahrenheit!")
+            if self.verbose:
+                print("🔔 Your input is in Celsius! We will convert it to Fahrenheit!")
             #return False
             return False
         else:
-            raise ValueError("Invalid input. Please enter the temperature with the correct 'C' or F' prefix.")
+            raise ValueError(INVALID_TEMPERATURE_MESSAGE)
 
 
     def convert_to_fahrenheit(self):
@@ -66,6 +161,271 @@ class TemperatureConverter:
         #round the result to 2 decimal places
         return round((self.temperature - 32) * 5/9, 2)
 
+    def convert_to(self, unit:str):
+        """
+        This method is used to convert the temperature to any unit of the
+        conversion graph, e.g. 'K' (Kelvin) or 'R' (Rankine).
+        The F <-> C methods above keep their own formulas, so their rounding
+        stays exactly the same as before.
+        """
+        #round the result to 2 decimal places
+        return round(temperature_graph.convert(self.temperature, self.unit, unit.upper()), 2)
+
+    @staticmethod
+    def convert_many(temperatures, verbose:bool=False):
+        """
+        This method is used to convert many temperatures at once, e.g. a whole sensor log.
+        It takes a sequence or numpy array of strings like "F98.6" or "C37",
+        parses all the prefixes and values with numpy and converts them in one pass,
+        without creating one object per reading.
+        Set verbose to True to print the message of every reading.
+        Returns two numpy arrays: the converted values and their units ('C' or 'F').
+        """
+        #upper case every reading, the same as the single reading version
+        readings = np.char.upper(np.asarray(temperatures, dtype=str))
+        if readings.size == 0:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype="<U1")
+        #every reading needs a prefix and a value
+        if readings.dtype.itemsize < 8 or np.any(np.char.str_len(readings) < 2):
+            raise ValueError(INVALID_TEMPERATURE_MESSAGE)
+        #look at the readings as a table of character codes, one row per reading
+        width = readings.dtype.itemsize // 4
+        codes = np.ascontiguousarray(readings.reshape(-1)).view(np.uint32).reshape(-1, width)
+        #the first column is the prefix
+        is_fahrenheit = codes[:, 0] == ord('F')
+        is_celsius = codes[:, 0] == ord('C')
+        if not np.all(is_fahrenheit | is_celsius):
+            raise ValueError(INVALID_TEMPERATURE_MESSAGE)
+        #the other columns are the value, numpy parses them all to float in one call
+        try:
+            values = np.ascontiguousarray(codes[:, 1:]).view(f"<U{width - 1}").reshape(-1).astype(np.float64)
+        except ValueError:
+            raise ValueError(INVALID_TEMPERATURE_MESSAGE) from None
+        if verbose:
+            for fahrenheit in is_fahrenheit:
+                if fahrenheit:
+                    print("🔔 Your input is in Fahrenheit! We will convert it to Celsius!")
+                else:
+                    print("🔔 Your input is in Celsius! We will convert it to Fahrenheit!")
+        converted, units = _convert_values(values, is_fahrenheit)
+        return converted.reshape(readings.shape), units.reshape(readings.shape)
+
+    @staticmethod
+    def convert_file(input_path, output_path, chunk_size:int=4 * 1024 * 1024):
+        """
+        This method is used to convert a large sensor log file, one reading per line.
+        The file is read in fixed-size byte chunks into one reusable buffer, the complete
+        lines of every chunk are parsed straight from a memoryview (no str per line),
+        and the converted readings are written to the output file chunk by chunk,
+        in the same format as the input (e.g. "F98.6" -> "C37.00").
+        Blank lines are skipped, any other invalid line raises ValueError.
+        Returns a dict with the number of readings, bytes read, seconds and MB/s.
+        """
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        #bytes of an unfinished line left at the start of the buffer
+        carry = 0
+        readings = 0
+        total_bytes = 0
+        start_time = time.perf_counter()
+        with open(input_path, 'rb') as source, open(output_path, 'wb') as target:
+            while True:
+                read_bytes = source.readinto(view[carry:])
+                if not read_bytes:
+                    #the last line may not end with a newline
+                    if carry:
+                        readings += _convert_chunk(bytes(view[:carry]) + b"\n", target)
+                    break
+                total_bytes += read_bytes
+                end = carry + read_bytes
+                last_newline = buffer.rfind(b"\n", 0, end)
+                if last_newline == -1:
+                    if end == chunk_size:
+                        raise ValueError(f"A line is longer than the chunk size of {chunk_size} bytes.")
+                    carry = end
+                    continue
+                readings += _convert_chunk(view[:last_newline + 1], target)
+                #move the unfinished line to the start of the buffer for the next read
+                carry = end - last_newline - 1
+                buffer[:carry] = bytes(view[last_newline + 1:end])
+        seconds = time.perf_counter() - start_time
+        return {
+            "readings": readings,
+            "bytes": total_bytes,
+            "seconds": seconds,
+            "mb_per_sec": total_bytes / 1_000_000 / seconds if seconds else None,
+        }
+
+
+def _convert_values(values, is_fahrenheit):
+    """
+    This function is used to convert parsed readings in one pass.
+    Fahrenheit readings are converted to Celsius and Celsius readings to Fahrenheit.
+    """
+    converted = np.where(is_fahrenheit, (values - 32) * 5/9, (values * 9/5) + 32)
+    units = np.where(is_fahrenheit, 'C', 'F')
+    #round the result to 2 decimal places, the same as the single reading version
+    return _round_2(converted), units
+
+
+def _round_2(values):
+    """
+    This function is used to round values to 2 decimal places exactly like round(value, 2).
+    np.round(values, 2) rounds values * 100, which is not exact, so about 1% of the
+    results differ from round(), e.g. 229.595 (F445.271) gives 229.6 instead of 229.59.
+    np.rint(values * 100) / 100 is the same as round() unless values * 100 is within its
+    float error of a half, so only those few values (and huge or not finite ones)
+    are rounded with round() itself.
+    """
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    distance_to_half = np.abs(scaled - np.floor(scaled) - 0.5)
+    #written with 'not' so NaN is unsure as well
+    unsure = ~(distance_to_half > np.abs(scaled) * 1e-13) | ~(np.abs(values) < 1e12)
+    if np.any(unsure):
+        rounded[unsure] = [round(value, 2) for value in values[unsure].tolist()]
+    return rounded
+
+
+#longest line the fast path handles, longer lines are parsed with _parse_lines_slow
+_MAX_FAST_LINE = 64
+
+
+def _parse_lines(data):
+    """
+    This function is used to parse a buffer of complete lines (ending with a newline)
+    like b"F98.6\nC37\n" with numpy and without a str per line.
+    Every line is copied into one row of a table of bytes, padded with zero bytes:
+    the first column is the prefix and the rest of every row is parsed to float
+    in one numpy call, which follows the same rules as float().
+    Returns the values and a True/False Fahrenheit array, or None when a line
+    is not valid or too long (it is then parsed with _parse_lines_slow).
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    #a zero byte inside a line would be taken as the padding
+    if np.any(raw == 0):
+        return None
+    line_end = np.flatnonzero(raw == 10)
+    line_start = np.empty_like(line_end)
+    line_start[0] = 0
+    line_start[1:] = line_end[:-1] + 1
+    #skip blank lines, a line with only '\r' is blank as well
+    length = line_end - line_start
+    not_blank = (length > 1) | ((length == 1) & (raw[line_end - 1] != 13))
+    line_start = line_start[not_blank]
+    length = length[not_blank]
+    if len(length) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+    width = int(length.max())
+    if width > _MAX_FAST_LINE or np.any(length < 2):
+        return None
+    #the prefix must be 'F' or 'C' in any case, the same as the single reading version
+    prefix = raw[line_start] | 0x20
+    is_fahrenheit = prefix == ord('f')
+    if not np.all(is_fahrenheit | (prefix == ord('c'))):
+        return None
+    #one row per line with the bytes after the prefix, zero bytes after the end of the line
+    columns = np.arange(1, width)
+    rows = raw.take(np.minimum(line_start[:, None] + columns, len(raw) - 1))
+    rows[columns >= length[:, None]] = 0
+    try:
+        values = rows.view(f"S{width - 1}").reshape(-1).astype(np.float64)
+    except ValueError:
+        return None
+    if not np.all(np.isfinite(values)):
+        return None
+    return values, is_fahrenheit
+
+
+def _parse_lines_slow(data):
+    """
+    This function is used to parse lines one by one with the same rules as the
+    single reading version, e.g. for readings like "F1e2". It raises ValueError
+    with the invalid line.
+    """
+    values = []
+    fahrenheit = []
+    for line in bytes(data).decode('utf-8').split('\n'):
+        if not line.strip():
+            continue
+        temperature = line.upper()
+        if len(temperature) < 2 or temperature[0] not in ('F', 'C'):
+            raise ValueError(f"{INVALID_TEMPERATURE_MESSAGE} Line: {line!r}")
+        try:
+            value = float(temperature[1:])
+        except ValueError:
+            raise ValueError(f"{INVALID_TEMPERATURE_MESSAGE} Line: {line!r}") from None
+        if not np.isfinite(value):
+            raise ValueError(f"{INVALID_TEMPERATURE_MESSAGE} Line: {line!r}")
+        values.append(value)
+        fahrenheit.append(temperature[0] == 'F')
+    return np.array(values, dtype=np.float64), np.array(fahrenheit, dtype=bool)
+
+
+#10, 100, ... 10 ** 18, to count the digits of a whole number
+_WHOLE_POWERS_OF_TEN = 10 ** np.arange(1, 19, dtype=np.int64)
+#largest value whose cents fit in an int64 with room to spare
+_MAX_FAST_VALUE = 9e16
+
+
+def _format_lines(values, units):
+    """
+    This function is used to format converted readings as lines like b"C37.00\n"
+    with numpy: every reading is one row of characters, and only the used
+    characters of every row are kept.
+    Values too large for int64 cents (or not finite) are formatted with _format_lines_slow.
+    """
+    if not np.all(np.abs(values) < _MAX_FAST_VALUE):
+        return _format_lines_slow(values, units)
+    cents = np.abs(np.rint(values * 100).astype(np.int64))
+    negative = values < 0
+    whole, fraction = np.divmod(cents, 100)
+    #number of digits of the whole part, at least one
+    whole_digits = 1 + np.searchsorted(_WHOLE_POWERS_OF_TEN, whole, side='right')
+    width = int(whole_digits.max()) if len(whole) else 1
+    #columns: unit, sign, whole digits, '.', two decimals, newline
+    rows = np.empty((len(whole), width + 6), dtype=np.uint8)
+    rows[:, 0] = np.where(units == 'C', ord('C'), ord('F'))
+    rows[:, 1] = ord('-')
+    for power in range(width):
+        rows[:, 1 + width - power] = 48 + (whole // 10 ** power) % 10
+    rows[:, width + 2] = ord('.')
+    rows[:, width + 3] = 48 + fraction // 10
+    rows[:, width + 4] = 48 + fraction % 10
+    rows[:, width + 5] = 10
+    keep = np.ones(rows.shape, dtype=bool)
+    keep[:, 1] = negative & (cents > 0)
+    keep[:, 2:width + 2] = np.arange(width) >= (width - whole_digits)[:, None]
+    return rows[keep].tobytes()
+
+
+def _format_lines_slow(values, units):
+    """
+    This function is used to format converted readings one by one with str formatting,
+    the same as _format_lines (a value that rounds to zero has no minus sign).
+    """
+    lines = []
+    for value, unit in zip(values.tolist(), units.tolist()):
+        text = f"{value:.2f}"
+        if text == "-0.00":
+            text = "0.00"
+        lines.append(f"{unit}{text}\n")
+    return "".join(lines).encode('ascii')
+
+
+def _convert_chunk(data, target):
+    """
+    This function is used to convert a buffer of complete lines and write the
+    result to the target file. Returns the number of readings.
+    """
+    parsed = _parse_lines(data)
+    if parsed is None:
+        parsed = _parse_lines_slow(data)
+    values, is_fahrenheit = parsed
+    converted, units = _convert_values(values, is_fahrenheit)
+    target.write(_format_lines(converted, units))
+    return len(values)
+
 if __name__ == "__main__":
     print("-" * 30)
     print("🌡️ Temperature Converter 🌡️")
@@ -0,0 +1,161 @@
+"""
+This file is used to read and count files from asyncio code without blocking the event loop.
+@author: Yaohui Zhang @tomie
+"""
+
+import asyncio
+import codecs
+import io
+
+from W3Activity1 import DEFAULT_CHUNK_SIZE, ReadFiles, _count_step, open_input
+
+# Default number of files processed at the same time by count_files_async()
+DEFAULT_CONCURRENCY = 8
+
+
+class AsyncReadFiles(ReadFiles):
+    """
+    ReadFiles with async counterparts of read_and_output() and count_asterisks().
+
+    Every read of a chunk runs in a thread executor, so the event loop keeps
+    running while the disk is busy, and the loop gets control back between
+    chunks. Cancelling the task stops the work at the next chunk and closes the file.
+    """
+    def __init__(self, file_path, mode="r", executor=None):
+        """
+        Initialize the AsyncReadFiles object.
+
+        Args:
+            file_path (str): Path to the file to read
+            mode (str): File mode, default is 'r' (read mode)
+            executor (concurrent.futures.Executor): Executor for the reads, default is the loop's executor
+        """
+        super().__init__(file_path, mode)
+        self.executor = executor
+
+    async def _read_text_chunks_async(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Read the file as text, one chunk at a time, with the reads in the executor.
+
+        Args:
+            chunk_size (int): Number of bytes to read at a time
+
+        Yields:
+            str: The decoded text of every chunk
+        """
+        loop = asyncio.get_running_loop()
+        # Translate '\r\n' and '\r' to '\n' like _read_text_chunks() does
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+        file = await loop.run_in_executor(self.executor, open_input, self.file_path)
+        try:
+            while True:
+                data = await loop.run_in_executor(self.executor, file.read, chunk_size)
+                if not data:
+                    break
+                yield decoder.decode(data)
+                # Give the other tasks a turn before the next chunk
+                await asyncio.sleep(0)
+        finally:
+            file.close()
+        # Raise an error if the file ends in the middle of a character
+        yield decoder.decode(b'', final=True)
+
+    async def read_and_output_async(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Read the file content and print it to the console, without blocking the event loop.
+
+        Args:
+            chunk_size (int): Number of bytes to read at a time
+
+        Returns:
+            str: The content of the file
+        """
+        try:
+            chunks = []
+            async for text in self._read_text_chunks_async(chunk_size):
+                chunks.append(text)
+            self.content = "".join(chunks)
+
+            print("=" * 60)
+            print(f"Content of file: {self.file_path}")
+            print("=" * 60)
+            print(self.content)
+            print("=" * 60)
+
+            return self.content
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return None
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return None
+
+    async def count_asterisks_async(self, character, chunk_size=DEFAULT_CHUNK_SIZE, verbose=True):
+        """
+        Count the number of '*' characters in the file, without blocking the event loop.
+
+        The file is counted chunk by chunk like count_asterisks_streaming(), so
+        the memory does not depend on the size of the file.
+
+        Args:
+            character (str): The character (or text) to count
+            chunk_size (int): Number of bytes to read at a time
+            verbose (bool): Print the count
+
+        Returns:
+            int: The number of characters in the file
+        """
+        try:
+            if not character:
+                raise ValueError("The text to count must not be empty")
+            asterisk_count = 0
+            carry = ""
+            async for text in self._read_text_chunks_async(chunk_size):
+                found, carry = _count_step(carry, text, character)
+                asterisk_count += found
+            if verbose:
+                print(f"\nNumber of {character} characters in '{self.file_path}': {asterisk_count}")
+            return asterisk_count
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return 0
+        except Exception as e:
+            print(f"Error counting asterisks: {e}")
+            return 0
+
+
+async def count_files_async(file_paths, character, concurrency=DEFAULT_CONCURRENCY,
+                            chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Count a character in many files, with at most `concurrency` files open at a time.
+
+    Args:
+        file_paths (iterable): Paths of the files to count
+        character (str): The character (or text) to count
+        concurrency (int): Maximum number of files processed at the same time
+        chunk_size (int): Number of bytes to read at a time
+        executor (concurrent.futures.Executor): Executor for the reads, default is the loop's executor
+
+    Returns:
+        dict: file path -> number of characters in the file
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def count_one(file_path):
+        async with semaphore:
+            read_files = AsyncReadFiles(file_path, executor=executor)
+            return file_path, await read_files.count_asterisks_async(character, chunk_size, verbose=False)
+
+    # If this task is cancelled, gather cancels every file that is still running
+    results = await asyncio.gather(*(count_one(file_path) for file_path in file_paths))
+    return dict(results)
+
+
+if __name__ == "__main__":
+    async def main():
+        read_files = AsyncReadFiles("demo_file.txt")
+        await read_files.count_asterisks_async('*')
+        counts = await count_files_async(["demo_file.txt"], '*', concurrency=2)
+        print(counts)
+
+    asyncio.run(main())
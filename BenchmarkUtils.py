@@ -0,0 +1,62 @@
+"""
+This file holds the helpers shared by the benchmarks (PayrollBenchmark.py and ReadFilesBenchmark.py).
+@author: Yaohui Zhang @tomie
+"""
+
+import platform
+import resource
+from queue import Empty
+
+# Seconds between checks that a benchmark process is still alive
+POLL_SECONDS = 1.0
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process and its finished children in MB.
+
+    VmHWM from /proc is used when there is one: ru_maxrss of a spawned process
+    starts from the peak of its parent, VmHWM only belongs to this process.
+    """
+    # On Linux ru_maxrss is in KB, on macOS it is in bytes
+    to_kb = 1024 if platform.system() == "Darwin" else 1
+    children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / to_kb
+    try:
+        with open("/proc/self/status") as f:
+            own_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        own_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / to_kb
+    return round(max(own_kb, children_kb) / 1024, 1)
+
+
+def get_result(process, queue, poll_seconds=POLL_SECONDS):
+    """
+    Wait for the result a benchmark process puts on its queue.
+
+    A bare queue.get() blocks forever if the process dies before it puts its
+    result (killed for memory, a crash in numpy), so the process is checked
+    every poll_seconds.
+
+    Args:
+        process (multiprocessing.Process): The started benchmark process
+        queue (multiprocessing.Queue): The queue it puts its result on
+        poll_seconds (float): Seconds to wait between checks
+
+    Returns:
+        The result put on the queue
+
+    Raises:
+        RuntimeError: If the process exits without a result
+    """
+    while True:
+        try:
+            return queue.get(timeout=poll_seconds)
+        except Empty:
+            if process.is_alive():
+                continue
+        # The result may have been put just before the process exited
+        try:
+            return queue.get(timeout=poll_seconds)
+        except Empty:
+            process.join()
+            raise RuntimeError(f"the benchmark process exited with code {process.exitcode} without a result")
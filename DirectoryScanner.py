@@ -0,0 +1,231 @@
+"""
+This file is used to count characters or texts in every file of a directory tree,
+with a thread pool for reading the files and a process pool for the large ones.
+@author: Yaohui Zhang @tomie
+
+Usage:
+    python DirectoryScanner.py logs "*"
+    python DirectoryScanner.py logs ERROR WARN --threads 16 --processes 4 --extensions .log .txt
+"""
+
+import argparse
+import mmap
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from W3Activity1 import DEFAULT_CHUNK_SIZE, _count_in_chunks, _count_step, _has_newline, detect_compression, open_input
+
+# Files larger than this are counted in the process pool instead of a thread (8 MB)
+DEFAULT_CPU_THRESHOLD = 8 * 1024 * 1024
+# Index files written next to the text files by ReadFiles, they are never scanned
+SIDECAR_SUFFIXES = (".lines", ".words", ".counts.json", ".tmp")
+
+
+def count_file(file_path, needles, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count every needle in one file, with the same result as bytes.count.
+
+    A small file is read in one go, a large file is counted through a memory map
+    chunk by chunk, and a gzip, bz2 or xz file is decompressed chunk by chunk.
+    The UTF-8 bytes are counted without decoding the file: UTF-8 is
+    self-synchronizing, so the count is the same as on the decoded text.
+
+    Args:
+        file_path (str): Path to the file
+        needles (list): The UTF-8 bytes of every text to count
+        chunk_size (int): Number of bytes to count at a time in a large file
+
+    Returns:
+        tuple: (size of the file in bytes, decompressed for a compressed file,
+        list of counts in the order of needles)
+    """
+    if detect_compression(file_path) is not None:
+        size = 0
+        counts = [0] * len(needles)
+        carries = [needle[:0] for needle in needles]
+        with open_input(file_path) as f:
+            for data in iter(lambda: f.read(chunk_size), b''):
+                size += len(data)
+                for index, needle in enumerate(needles):
+                    found, carries[index] = _count_step(carries[index], data, needle)
+                    counts[index] += found
+        return size, counts
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= chunk_size:
+            data = f.read()
+            return len(data), [_count_in_chunks([data], needle) for needle in needles]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            counts = []
+            for needle in needles:
+                chunks = (mapped[start:start + chunk_size] for start in range(0, len(mapped), chunk_size))
+                counts.append(_count_in_chunks(chunks, needle))
+            return len(mapped), counts
+
+
+class DirectoryScanner:
+    """
+    Count characters or texts in every file of a directory tree.
+
+    Small files are read and counted by a bounded thread pool, since most of
+    their time is spent waiting for the disk. Files larger than cpu_threshold are
+    sent to a process pool, where counting is not limited by the GIL; the worker
+    maps the file itself, so no file content is sent between processes.
+    Only a few files per worker are in flight at a time, so a tree of any size
+    uses the same memory. The result of every file is given as soon as it is done.
+
+    Compressed files are counted on their decompressed bytes. The bytes are not
+    newline-translated like a file read in text mode, so patterns with '\r' or
+    '\n' are not accepted.
+    """
+    def __init__(self, directory, patterns, threads=None, processes=None,
+                 cpu_threshold=DEFAULT_CPU_THRESHOLD, extensions=None):
+        """
+        Initialize the scanner.
+
+        Args:
+            directory (str): Root of the tree to scan
+            patterns (iterable): The characters (or texts) to count
+            threads (int): Number of reading threads, default is 4 per CPU (at most 32)
+            processes (int): Number of counting processes, default is the number of CPUs
+            cpu_threshold (int): Size in bytes from which a file goes to the process pool
+            extensions (iterable): Only scan files with these extensions, e.g. [".txt"], default is all
+        """
+        self.directory = directory
+        self.patterns = list(dict.fromkeys(patterns))
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("The patterns to count must not be empty")
+        if any(_has_newline(pattern) for pattern in self.patterns):
+            raise ValueError("The scanner counts raw bytes, patterns with '\\r' or '\\n' are not supported")
+        self.needles = [pattern.encode('utf-8') for pattern in self.patterns]
+        self.threads = threads or min(32, 4 * os.cpu_count())
+        self.processes = processes or os.cpu_count()
+        self.cpu_threshold = cpu_threshold
+        self.extensions = tuple(extensions) if extensions else None
+        self.totals = None
+
+    def walk(self):
+        """
+        Walk the tree without recursion and yield the files to scan.
+
+        Yields:
+            str: Path of every regular file, directories are not followed through symlinks
+        """
+        directories = [self.directory]
+        while directories:
+            directory = directories.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        elif entry.is_file() and not entry.name.endswith(SIDECAR_SUFFIXES):
+                            if self.extensions is None or entry.name.endswith(self.extensions):
+                                yield entry.path
+            except OSError as e:
+                print(f"Error reading directory '{directory}': {e}")
+
+    def scan(self):
+        """
+        Count the patterns in every file, giving the results in the order the files finish.
+
+        When the generator is finished, self.totals holds the totals of the scan.
+
+        Yields:
+            dict: file, bytes and counts (pattern -> count) of one file,
+            or file and error if the file could not be read
+        """
+        totals = Counter()
+        files = 0
+        errors = 0
+        size_total = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.threads) as threads, ProcessPoolExecutor(self.processes) as processes:
+            # future -> path of the file it counts
+            pending = {}
+            in_flight_limit = 2 * (self.threads + self.processes)
+
+            def finished(done):
+                nonlocal files, errors, size_total
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        size, counts = future.result()
+                    except Exception as e:
+                        errors += 1
+                        yield {"file": file_path, "error": str(e)}
+                        continue
+                    counts = dict(zip(self.patterns, counts))
+                    files += 1
+                    size_total += size
+                    totals.update(counts)
+                    yield {"file": file_path, "bytes": size, "counts": counts}
+
+            for file_path in self.walk():
+                try:
+                    large = os.path.getsize(file_path) > self.cpu_threshold
+                except OSError as e:
+                    errors += 1
+                    yield {"file": file_path, "error": str(e)}
+                    continue
+                executor = processes if large else threads
+                pending[executor.submit(count_file, file_path, self.needles)] = file_path
+                if len(pending) >= in_flight_limit:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finished(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+        seconds = time.perf_counter() - start
+        self.totals = {
+            "files": files,
+            "errors": errors,
+            "bytes": size_total,
+            "counts": {pattern: totals[pattern] for pattern in self.patterns},
+            "seconds": round(seconds, 3),
+            "files_per_sec": round(files / seconds, 1) if seconds else None,
+            "mb_per_sec": round(size_total / 1024 / 1024 / seconds, 1) if seconds else None,
+        }
+
+    def run(self, verbose=True):
+        """
+        Scan the whole tree, print every file as it finishes and then the totals.
+
+        Args:
+            verbose (bool): Print the result of every file, not only the totals
+
+        Returns:
+            dict: The totals of the scan
+        """
+        for result in self.scan():
+            if "error" in result:
+                print(f"Error: '{result['file']}': {result['error']}")
+            elif verbose:
+                counts = ", ".join(f"{pattern}: {count}" for pattern, count in result["counts"].items())
+                print(f"{result['file']} | {counts}")
+        print("=" * 60)
+        print(f"Scanned {self.totals['files']} files ({self.totals['bytes'] / 1024 / 1024:.1f} MB) "
+              f"in {self.totals['seconds']} s, {self.totals['errors']} errors")
+        print(f"{self.totals['files_per_sec']} files/sec, {self.totals['mb_per_sec']} MB/s")
+        for pattern, count in self.totals["counts"].items():
+            print(f"Number of {pattern} characters: {count}")
+        print("=" * 60)
+        return self.totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count characters or texts in every file of a directory tree.")
+    parser.add_argument("directory", help="root of the tree to scan")
+    parser.add_argument("patterns", nargs="+", help="characters or texts to count")
+    parser.add_argument("--threads", type=int, help="number of reading threads")
+    parser.add_argument("--processes", type=int, help="number of counting processes for large files")
+    parser.add_argument("--cpu-threshold", type=int, default=DEFAULT_CPU_THRESHOLD,
+                        help="size in bytes from which a file is counted in a process")
+    parser.add_argument("--extensions", nargs="+", help="only scan files with these extensions")
+    parser.add_argument("--quiet", action="store_true", help="only print the totals")
+    args = parser.parse_args()
+
+    DirectoryScanner(args.directory, args.patterns, args.threads, args.processes,
+                     args.cpu_threshold, args.extensions).run(verbose=not args.quiet)
@@ -3,6 +3,11 @@ This file is used to calculate the gross pay of a worker in NZ.
 @author: Yaohui Zhang @tomie
 """
 
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
 # Tax rate list
 # Each item is a tuple: (min_income, max_income, tax_rate)
 # Tax brackets are ordered from lowest to highest income
@@ -62,6 +67,136 @@ def calculate_tax(gross_pay):
     return total_tax
 
 
+# Function to compile the tax bracket list into arrays for vectorized calculation
+# The input is a tax bracket list in the same shape as tax_rate
+# It returns three numpy arrays:
+# 1. thresholds: the income where each bracket starts (the previous bracket's max_income)
+# 2. rates: the tax rate of each bracket as a fraction (10.5% -> 0.105)
+# 3. base_tax: the total tax already paid on all income below each threshold
+# For example: base_tax for the second bracket is 15,600 × 10.5% = $1,638
+def compile_tax_table(brackets=tax_rate):
+    thresholds = [0.0]
+    rates = []
+    for min_income, max_income, rate in brackets:
+        rates.append(rate / 100)
+        thresholds.append(max_income)
+    # The last threshold is infinity, it is only the end of the top bracket
+    thresholds = np.array(thresholds[:-1], dtype=np.float64)
+    rates = np.array(rates, dtype=np.float64)
+    # Tax of every full bracket, then add them up to get the tax below each threshold
+    bracket_tax = np.diff(thresholds) * rates[:-1]
+    base_tax = np.concatenate(([0.0], np.cumsum(bracket_tax)))
+    return thresholds, rates, base_tax
+
+
+# Compile the default tax table once, so every vectorized call can reuse it
+compiled_tax_table = compile_tax_table()
+
+
+# Function to calculate the tax amount for many incomes at the same time
+# The input is a number or an array of gross pay (annual income before tax)
+# Instead of looping through the brackets for every income, we find the bracket of
+# each income with np.searchsorted and use the precomputed base tax:
+# tax = base_tax of the bracket + (income - threshold of the bracket) × rate
+# Returns a numpy array with the same shape as the input
+def calculate_tax_vectorized(gross_pay, table=compiled_tax_table):
+    thresholds, rates, base_tax = table
+    gross_pay = np.asarray(gross_pay, dtype=np.float64)
+    # Negative income has no tax, the same as calculate_tax()
+    income = np.maximum(gross_pay, 0.0)
+    # Index of the bracket each income falls into
+    bracket = np.searchsorted(thresholds, income, side="left") - 1
+    bracket = np.maximum(bracket, 0)
+    return base_tax[bracket] + (income - thresholds[bracket]) * rates[bracket]
+
+
+# Function to compile the tax bracket list into whole-number arrays for fixed-point calculation
+# Money is in cents and rates are in thousandths (10.5% -> 105), so every step is integer math
+# Returns thresholds (cents), rates (thousandths) and base tax (thousandths of a cent)
+def compile_fixed_point_tax_table(brackets=tax_rate):
+    thresholds, rates, base_tax = compile_tax_table(brackets)
+    thresholds = np.rint(thresholds * 100).astype(np.int64)
+    rates = np.rint(rates * 1000).astype(np.int64)
+    # Keep the base tax in thousandths of a cent so rounding happens only once at the end
+    base_tax = np.concatenate(([0], np.cumsum(np.diff(thresholds) * rates[:-1]))).astype(np.int64)
+    return thresholds, rates, base_tax
+
+
+compiled_fixed_point_tax_table = compile_fixed_point_tax_table()
+
+
+# Function to calculate the tax amount for many incomes with integer (fixed-point) math
+# The input is a number or an array of gross pay in whole cents
+# Returns the tax in whole cents (rounded half up), as an int64 numpy array
+def calculate_tax_fixed_point(gross_pay_cents, table=compiled_fixed_point_tax_table):
+    thresholds, rates, base_tax = table
+    income = np.maximum(np.asarray(gross_pay_cents, dtype=np.int64), 0)
+    bracket = np.maximum(np.searchsorted(thresholds, income, side="left") - 1, 0)
+    tax = base_tax[bracket] + (income - thresholds[bracket]) * rates[bracket]
+    return (tax + 500) // 1000
+
+
+# Function to calculate the tax amount for a large array of incomes with several processes
+# The array is split into one part per process, each process runs calculate_tax_vectorized()
+# on its part, and the results are joined back together in the same order
+# A pool can be passed in so many calls can share the same worker processes
+def calculate_tax_parallel(gross_pay, processes=None, pool=None):
+    processes = processes or os.cpu_count()
+    parts = np.array_split(np.asarray(gross_pay, dtype=np.float64), processes)
+    if pool is None:
+        with Pool(processes) as pool:
+            return np.concatenate(pool.map(calculate_tax_vectorized, parts))
+    return np.concatenate(pool.map(calculate_tax_vectorized, parts))
+
+
+# Column names of the tax curve, in the order they are exported
+tax_curve_columns = ("income", "tax", "net_pay", "effective_rate", "marginal_rate")
+
+
+# Function to calculate the tax curve over a grid of incomes in one vectorized pass
+# The input is the start, stop and step of the income grid (stop is included)
+# For every income on the grid we calculate:
+# 1. tax and net pay (income - tax)
+# 2. effective rate: the share of the whole income paid as tax (tax / income)
+# 3. marginal rate: the tax rate of the next dollar earned
+# For example: at $60,000 the effective rate is about 17% but the marginal rate is 30%
+# Returns a dict of numpy arrays (one array per column), ready to plot or export
+def calculate_tax_curve(start=0, stop=500000, step=1, table=compiled_tax_table):
+    thresholds, rates, base_tax = table
+    income = np.arange(start, stop + step, step, dtype=np.float64)
+    income = income[income <= stop]
+    tax = calculate_tax_vectorized(income, table)
+    # Avoid dividing by zero for an income of $0, its effective rate is 0
+    effective_rate = np.divide(tax, income, out=np.zeros_like(tax), where=income > 0)
+    # The next dollar falls into the bracket that starts at or below this income
+    marginal_rate = rates[np.searchsorted(thresholds, np.maximum(income, 0.0), side="right") - 1]
+    return {
+        "income": income,
+        "tax": tax,
+        "net_pay": income - tax,
+        "effective_rate": effective_rate,
+        "marginal_rate": marginal_rate,
+    }
+
+
+# Function to export the tax curve to a columnar file for plotting
+# The file type is chosen by the file extension:
+# 1. '.npy' saves one numpy structured array (load it with np.load)
+# 2. anything else saves a CSV file with a header row
+# Returns the path of the file
+def export_tax_curve(curve, file_path):
+    columns = [np.asarray(curve[name], dtype=np.float64) for name in tax_curve_columns]
+    if str(file_path).endswith(".npy"):
+        table = np.empty(len(columns[0]), dtype=[(name, np.float64) for name in tax_curve_columns])
+        for name, column in zip(tax_curve_columns, columns):
+            table[name] = column
+        np.save(file_path, table)
+    else:
+        np.savetxt(file_path, np.column_stack(columns), delimiter=",",
+                   header=",".join(tax_curve_columns), comments="", fmt="%.6f")
+    return file_path
+
+
 # Function to calculate the gross pay after tax (net pay)
 # The input is the hours worked and the hourly rate
 # This function combines the two functions above:
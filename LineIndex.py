@@ -0,0 +1,180 @@
+"""
+This file is used to index the lines of a large text file, so any range of
+lines can be read without reading the rest of the file.
+@author: Yaohui Zhang @tomie
+"""
+
+import hashlib
+import mmap
+import os
+from array import array
+
+import numpy as np
+
+# Number of bytes scanned for newlines at a time (16 MB)
+SCAN_CHUNK_SIZE = 16 * 1024 * 1024
+# Number of bytes at the start of the file used to check that it was only appended to
+HEAD_SIZE = 64 * 1024
+# Size of the saved header: indexed size, mtime and head size (3 x 8 bytes), then the sha256 of the head
+HEADER_SIZE = 3 * 8 + 32
+
+
+class LineIndex:
+    """
+    A line index of a text file: the byte offset of every newline.
+
+    The offsets are found with numpy over a memory map of the file, stored in an
+    array('Q') and saved next to the file as <file>.lines, with the size, the mtime
+    and a hash of the first bytes of the file. When the file grows and starts with
+    the same bytes, only the new bytes are scanned; any other change builds the
+    index again. The file is mapped again only when it changes.
+    """
+    def __init__(self, file_path):
+        """
+        Initialize the index and load the saved index file if there is one.
+
+        Args:
+            file_path (str): Path to the text file
+        """
+        self.file_path = file_path
+        self.index_path = f"{file_path}.lines"
+        # Byte offsets of every newline in the file
+        self.newlines = array('Q')
+        # Number of bytes of the file that are indexed
+        self.indexed_size = 0
+        # mtime of the file when it was indexed, and the sha256 of its first head_size bytes
+        self.mtime_ns = None
+        self.head_size = 0
+        self.head_hash = None
+        self._mmap = None
+        self._load()
+
+    def __enter__(self):
+        """Enables the use of 'with' statement, the memory map is released at the end."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Releases the memory map when exiting the 'with' block."""
+        self.close()
+
+    def close(self):
+        """Releases the memory map of the file, if there is one."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _load(self):
+        """Load the saved index: the header, then the newline offsets."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                saved = f.read()
+        except FileNotFoundError:
+            return
+        if len(saved) < HEADER_SIZE or (len(saved) - HEADER_SIZE) % 8:
+            # A broken (or old) index file: the index is built again on the first update
+            return
+        header = array('Q')
+        header.frombytes(saved[:24])
+        self.indexed_size, self.mtime_ns, self.head_size = header
+        self.head_hash = saved[24:HEADER_SIZE]
+        self.newlines = array('Q')
+        self.newlines.frombytes(saved[HEADER_SIZE:])
+
+    def save(self):
+        """Save the index next to the file, through a temporary file so it is never half written."""
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, 'wb') as f:
+            array('Q', [self.indexed_size, self.mtime_ns, self.head_size]).tofile(f)
+            f.write(self.head_hash)
+            self.newlines.tofile(f)
+        os.replace(temporary_path, self.index_path)
+
+    @staticmethod
+    def _head_hash(mapped, size):
+        """Return the sha256 of the first size bytes of the mapped file (the map is None for an empty file)."""
+        return hashlib.sha256(mapped[:size] if size else b'').digest()
+
+    def _get_mmap(self, size):
+        """Return a memory map of the file, mapped again if the file size has changed."""
+        if self._mmap is not None and len(self._mmap) == size:
+            return self._mmap
+        self.close()
+        if size:
+            with open(self.file_path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _scan(self, mapped, start, end):
+        """Append the offsets of the newlines between the byte offsets start and end."""
+        for position in range(start, end, SCAN_CHUNK_SIZE):
+            chunk = np.frombuffer(mapped, dtype=np.uint8, count=min(SCAN_CHUNK_SIZE, end - position), offset=position)
+            found = np.flatnonzero(chunk == 10).astype(np.uint64) + position
+            self.newlines.frombytes(found.tobytes())
+            # Release the view, an mmap can not be closed while a view is alive
+            del chunk
+
+    def update(self):
+        """
+        Bring the index up to date with the file and save it if it changed.
+
+        A file with the same size and mtime has not changed. A file that only grew
+        (it starts with the same bytes and the last indexed newline is still a
+        newline) is scanned from the end of the index. Any other change, e.g. a
+        rewrite of the same size, builds the whole index again.
+
+        Returns:
+            LineIndex: The index itself
+        """
+        stat = os.stat(self.file_path)
+        size = stat.st_size
+        unchanged = size == self.indexed_size and stat.st_mtime_ns == self.mtime_ns
+        if unchanged and self._mmap is not None:
+            return self
+        if not unchanged:
+            # The file may have been replaced by another one of the same size, map it again
+            self.close()
+        mapped = self._get_mmap(size)
+        if not unchanged:
+            appended = (size >= self.indexed_size and self._head_hash(mapped, self.head_size) == self.head_hash
+                        and not (self.newlines and mapped[self.newlines[-1]] != 10))
+            if not appended:
+                self.newlines = array('Q')
+                self.indexed_size = 0
+            self._scan(mapped, self.indexed_size, size)
+            self.indexed_size = size
+            self.mtime_ns = stat.st_mtime_ns
+            # Hash the head of the file as it is now, so a later rewrite of those bytes is found
+            self.head_size = min(size, HEAD_SIZE)
+            self.head_hash = self._head_hash(mapped, self.head_size)
+            self.save()
+        return self
+
+    def line_count(self):
+        """
+        Return the number of lines of the file (a last line without a newline counts too).
+        """
+        self.update()
+        ends_without_newline = self.indexed_size and (not self.newlines or self.newlines[-1] != self.indexed_size - 1)
+        return len(self.newlines) + (1 if ends_without_newline else 0)
+
+    def get_lines(self, start, stop):
+        """
+        Read lines start..stop-1 (like a list slice, counted from 0) without the newlines.
+
+        Only the bytes of those lines are read from the memory map. Lines are split
+        on '\n', so the '\r' of a Windows ('\r\n') line ending is removed too.
+
+        Args:
+            start (int): First line
+            stop (int): Line after the last line
+
+        Returns:
+            list: The lines as str
+        """
+        start, stop, _ = slice(start, stop).indices(self.line_count())
+        if start >= stop:
+            return []
+        first_byte = self.newlines[start - 1] + 1 if start else 0
+        last_byte = self.newlines[stop - 1] if stop - 1 < len(self.newlines) else self.indexed_size
+        lines = self._mmap[first_byte:last_byte].decode('utf-8').split('\n')
+        return [line.removesuffix('\r') for line in lines]
@@ -0,0 +1,159 @@
+"""
+This file is used to calculate PAYE (Pay As You Earn) tax for every pay period
+of a pay run, with year-to-date (YTD) reconciliation.
+@author: Yaohui Zhang @tomie
+"""
+
+import numpy as np
+
+from GrossPay import calculate_gross_pay, compile_tax_table, tax_rate
+
+# Number of pay periods in one tax year for each pay frequency
+PERIODS_PER_YEAR = {
+    "weekly": 52,
+    "fortnightly": 26,
+}
+
+
+class PayeEngine:
+    """
+    A class to run weekly or fortnightly pay runs and keep the YTD state of every employee.
+
+    We use the cumulative method: in pay period k of P, the tax brackets are scaled
+    by k / P, so the tax due to date is the annual tax of the YTD gross pay spread
+    over the part of the year that has passed. The PAYE of this period is the tax
+    due to date minus the tax already paid, so any over or under payment from an
+    earlier period is reconciled automatically.
+
+    All money is stored in whole cents (int64) so the YTD totals never drift.
+    """
+    def __init__(self, employee_count: int, frequency: str = "weekly", brackets=tax_rate):
+        """
+        Initialize the engine with empty YTD state and precomputed per-period tax tables.
+
+        Args:
+            employee_count (int): Number of employees, every employee is an index 0..n-1
+            frequency (str): 'weekly' or 'fortnightly'
+            brackets (list): Tax brackets in the same shape as GrossPay.tax_rate
+        """
+        if frequency not in PERIODS_PER_YEAR:
+            raise ValueError(f"Invalid pay frequency '{frequency}'. Please use one of: {', '.join(PERIODS_PER_YEAR)}.")
+        self.employee_count = employee_count
+        self.frequency = frequency
+        self.periods_per_year = PERIODS_PER_YEAR[frequency]
+        # The pay period that was processed last, 0 means no pay run yet
+        self.period = 0
+        self._build_period_tables(brackets)
+        # YTD state, one slot per employee index
+        self.ytd_gross = np.zeros(employee_count, dtype=np.int64)
+        self.ytd_tax = np.zeros(employee_count, dtype=np.int64)
+
+    def _build_period_tables(self, brackets):
+        """
+        Precompute the thresholds and base tax (in cents) of every pay period.
+        Row k - 1 of each table is the bracket table of pay period k.
+        """
+        thresholds, rates, base_tax = compile_tax_table(brackets)
+        # Fraction of the tax year that has passed at the end of each period: 1/P, 2/P, ... 1
+        year_fraction = np.arange(1, self.periods_per_year + 1, dtype=np.float64) / self.periods_per_year
+        self.period_thresholds = np.rint(year_fraction[:, None] * thresholds[None, :] * 100).astype(np.int64)
+        self.period_base_tax = year_fraction[:, None] * base_tax[None, :] * 100
+        self.rates = rates
+
+    def tax_due_to_date(self, period: int, ytd_gross_cents):
+        """
+        Calculate the total tax (in cents) due on YTD gross pay at the end of a pay period.
+
+        Args:
+            period (int): The pay period number, 1..periods_per_year
+            ytd_gross_cents (np.ndarray): YTD gross pay in cents
+
+        Returns:
+            np.ndarray: Tax due to date in whole cents
+        """
+        thresholds = self.period_thresholds[period - 1]
+        base_tax = self.period_base_tax[period - 1]
+        income = np.maximum(ytd_gross_cents, 0)
+        bracket = np.maximum(np.searchsorted(thresholds, income, side="left") - 1, 0)
+        tax = base_tax[bracket] + (income - thresholds[bracket]) * self.rates[bracket]
+        return np.rint(tax).astype(np.int64)
+
+    def run_pay_period(self, hours_worked, hourly_rate, employee_index=None):
+        """
+        Process one pay run for all (or some) employees in a single vectorized step.
+
+        Args:
+            hours_worked (array-like): Hours worked in this pay period
+            hourly_rate (array-like): Hourly rate of each employee
+            employee_index (array-like): Employee indices of the rows, default is every employee in order
+
+        Returns:
+            np.ndarray: PAYE of this period in dollars, negative values are refunds
+        """
+        if self.period >= self.periods_per_year:
+            raise ValueError("The tax year is finished. Please call reset() before the next pay run.")
+        # Check the inputs and work out the new YTD values first, the state only changes once they are all valid
+        period = self.period + 1
+        # Gross pay of this period in whole cents
+        gross_pay = calculate_gross_pay(np.asarray(hours_worked, dtype=np.float64),
+                                        np.asarray(hourly_rate, dtype=np.float64))
+        if employee_index is None:
+            # Fast path: one row per employee, in employee index order
+            gross_cents = np.rint(np.broadcast_to(gross_pay, (self.employee_count,)) * 100).astype(np.int64)
+            ytd_gross = self.ytd_gross + gross_cents
+            tax_due = self.tax_due_to_date(period, ytd_gross)
+            paye = tax_due - self.ytd_tax
+            self.ytd_gross = ytd_gross
+            self.ytd_tax = tax_due
+            self.period = period
+            return paye / 100
+        employee_index = np.asarray(employee_index, dtype=np.int64)
+        if employee_index.ndim != 1:
+            raise ValueError("employee_index must be a one-dimensional array of employee indices.")
+        if employee_index.size and (employee_index.min() < 0 or employee_index.max() >= self.employee_count):
+            raise IndexError(f"employee_index must be between 0 and {self.employee_count - 1}.")
+        gross_cents = np.rint(np.broadcast_to(gross_pay, employee_index.shape) * 100).astype(np.int64)
+        # Group the rows by employee, an employee can appear more than once in the same pay run
+        paid, first_row, row_to_paid = np.unique(employee_index, return_index=True, return_inverse=True)
+        ytd_gross = self.ytd_gross[paid] + np.bincount(row_to_paid, weights=gross_cents).astype(np.int64)
+        # Reconcile only the employees that are paid in this pay run
+        tax_due = self.tax_due_to_date(period, ytd_gross)
+        paye = tax_due - self.ytd_tax[paid]
+        self.ytd_gross[paid] = ytd_gross
+        self.ytd_tax[paid] = tax_due
+        self.period = period
+        # Map the PAYE back to the rows of this pay run, duplicated rows share the payment of the first row
+        paye_by_row = np.zeros(employee_index.shape, dtype=np.int64)
+        paye_by_row[first_row] = paye
+        return paye_by_row / 100
+
+    def ytd_summary(self, employee_index):
+        """
+        Return the YTD gross pay, tax and net pay (in dollars) of one employee.
+        """
+        gross = self.ytd_gross[employee_index] / 100
+        tax = self.ytd_tax[employee_index] / 100
+        return {"period": self.period, "ytd_gross": gross, "ytd_tax": tax, "ytd_net": gross - tax}
+
+    def reset(self):
+        """
+        Clear the YTD state for a new tax year.
+        """
+        self.period = 0
+        self.ytd_gross[:] = 0
+        self.ytd_tax[:] = 0
+
+
+if __name__ == "__main__":
+    # Test the engine with a weekly pay run of one million employees
+    employee_count = 1_000_000
+    rng = np.random.default_rng(0)
+    engine = PayeEngine(employee_count, "weekly")
+    hours = rng.uniform(10, 50, employee_count).round(2)
+    rates = rng.uniform(23.15, 120, employee_count).round(2)
+    print("--------------------------------")
+    for _ in range(engine.periods_per_year):
+        paye = engine.run_pay_period(hours, rates)
+    print(f"Processed {engine.period} weekly pay runs of {employee_count} employees")
+    print(f"Employee 0: {engine.ytd_summary(0)}")
+    print("--------------------------------")
@@ -0,0 +1,192 @@
+"""
+This file is used to benchmark how the GrossPay tax calculation scales
+from 1 million to 100 million payroll rows.
+@author: Yaohui Zhang @tomie
+
+Usage:
+    python PayrollBenchmark.py                       # 1M, 10M and 100M rows, every path
+    python PayrollBenchmark.py --sizes 1000000 --paths vectorized fixed_point
+    python PayrollBenchmark.py --output payroll_baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+import numpy as np
+
+from BenchmarkUtils import get_result, peak_rss_mb
+from GrossPay import (calculate_gross_pay, calculate_tax, calculate_tax_fixed_point,
+                      calculate_tax_parallel, calculate_tax_vectorized)
+
+# Default number of rows of every benchmark run
+DEFAULT_SIZES = [1_000_000, 10_000_000, 100_000_000]
+# Rows generated at a time, the whole data set is never held in memory
+DEFAULT_CHUNK_SIZE = 1_000_000
+# The scalar path runs one Python call per row, so by default it only runs on the
+# first rows of every size and the rows/sec is measured on those rows
+DEFAULT_SCALAR_LIMIT = 1_000_000
+
+
+def generate_payroll_chunks(total_rows, chunk_size=DEFAULT_CHUNK_SIZE, seed=2025):
+    """
+    Generate synthetic payroll data chunk by chunk.
+
+    Args:
+        total_rows (int): Number of rows to generate
+        chunk_size (int): Number of rows in each chunk
+        seed (int): Random seed, the same seed always gives the same data
+
+    Yields:
+        tuple: (hours_worked, hourly_rate) numpy arrays of one chunk
+    """
+    rng = np.random.default_rng(seed)
+    generated = 0
+    while generated < total_rows:
+        rows = min(chunk_size, total_rows - generated)
+        # Annual hours between part time and overtime, hourly rate from minimum wage up
+        hours_worked = rng.uniform(500, 2600, rows).round(2)
+        hourly_rate = rng.uniform(23.15, 150, rows).round(2)
+        generated += rows
+        yield hours_worked, hourly_rate
+
+
+def _run_scalar(chunks):
+    """Calculate the tax row by row with GrossPay.calculate_tax()."""
+    rows = 0
+    for hours_worked, hourly_rate in chunks:
+        for hours, rate in zip(hours_worked.tolist(), hourly_rate.tolist()):
+            calculate_tax(calculate_gross_pay(hours, rate))
+        rows += len(hours_worked)
+    return rows
+
+
+def _run_vectorized(chunks):
+    """Calculate the tax of a whole chunk at once with calculate_tax_vectorized()."""
+    rows = 0
+    for hours_worked, hourly_rate in chunks:
+        calculate_tax_vectorized(calculate_gross_pay(hours_worked, hourly_rate))
+        rows += len(hours_worked)
+    return rows
+
+
+def _run_multi_process(chunks, processes=None):
+    """Split every chunk over a pool of worker processes with calculate_tax_parallel()."""
+    rows = 0
+    processes = processes or os.cpu_count()
+    with Pool(processes) as pool:
+        for hours_worked, hourly_rate in chunks:
+            calculate_tax_parallel(calculate_gross_pay(hours_worked, hourly_rate), processes, pool)
+            rows += len(hours_worked)
+    return rows
+
+
+def _run_fixed_point(chunks):
+    """Calculate the tax in whole cents with calculate_tax_fixed_point()."""
+    rows = 0
+    for hours_worked, hourly_rate in chunks:
+        gross_cents = np.rint(calculate_gross_pay(hours_worked, hourly_rate) * 100).astype(np.int64)
+        calculate_tax_fixed_point(gross_cents)
+        rows += len(hours_worked)
+    return rows
+
+
+# Every benchmarked path, by name
+PATHS = {
+    "scalar": _run_scalar,
+    "vectorized": _run_vectorized,
+    "multi_process": _run_multi_process,
+    "fixed_point": _run_fixed_point,
+}
+
+
+def _benchmark_worker(path, rows, chunk_size, queue):
+    """Run one path in a fresh process so its peak RSS is not mixed with other runs."""
+    start = time.perf_counter()
+    processed = PATHS[path](generate_payroll_chunks(rows, chunk_size))
+    seconds = time.perf_counter() - start
+    queue.put({"rows": processed, "seconds": seconds, "peak_rss_mb": peak_rss_mb()})
+
+
+def run_benchmark(path, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run one benchmark in a child process.
+
+    Args:
+        path (str): Name of the path, one of PATHS
+        rows (int): Number of rows to process
+        chunk_size (int): Number of rows generated at a time
+
+    Returns:
+        dict: rows, seconds, rows_per_sec and peak_rss_mb of the run
+
+    Raises:
+        RuntimeError: If the child process exits without a result
+    """
+    # spawn gives every run a clean interpreter, so the peak RSS only belongs to this run
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_benchmark_worker, args=(path, rows, chunk_size, queue))
+    process.start()
+    result = get_result(process, queue)
+    process.join()
+    result["rows_per_sec"] = round(result["rows"] / result["seconds"]) if result["seconds"] else None
+    result["seconds"] = round(result["seconds"], 3)
+    return result
+
+
+def run_suite(sizes=DEFAULT_SIZES, paths=tuple(PATHS), chunk_size=DEFAULT_CHUNK_SIZE,
+              scalar_limit=DEFAULT_SCALAR_LIMIT):
+    """
+    Run every path at every size and collect the results.
+
+    Returns:
+        dict: The benchmark baseline, ready to be saved as JSON
+    """
+    results = []
+    for size in sizes:
+        for path in paths:
+            rows = min(size, scalar_limit) if path == "scalar" and scalar_limit else size
+            try:
+                result = run_benchmark(path, rows, chunk_size)
+            except RuntimeError as e:
+                print(f"Error running {path} on {size:,} rows: {e}")
+                continue
+            result.update({"path": path, "size": size})
+            results.append(result)
+            print(f"{path:>14} | {size:>11,} rows | {result['rows']:>11,} measured | "
+                  f"{result['rows_per_sec']:>13,} rows/sec | {result['peak_rss_mb']:>8} MB")
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "chunk_size": chunk_size,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the GrossPay tax calculation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="number of rows of each run")
+    parser.add_argument("--paths", nargs="+", choices=list(PATHS), default=list(PATHS), help="paths to benchmark")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows generated at a time")
+    parser.add_argument("--scalar-limit", type=int, default=DEFAULT_SCALAR_LIMIT,
+                        help="maximum rows for the scalar path, 0 means no limit")
+    parser.add_argument("--output", default="payroll_baseline.json", help="JSON file to save the baseline")
+    args = parser.parse_args()
+
+    print("--------------------------------")
+    print("GrossPay throughput benchmark")
+    print("--------------------------------")
+    baseline = run_suite(args.sizes, args.paths, args.chunk_size, args.scalar_limit)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+    print("--------------------------------")
+    print(f"Baseline saved to {args.output}")
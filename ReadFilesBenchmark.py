@@ -0,0 +1,384 @@
+"""
+This file is used to benchmark the methods of ReadFiles (W3Activity1.py and W3Activity2.py).
+@author: Yaohui Zhang @tomie
+
+Usage:
+    python ReadFilesBenchmark.py                     # 256 MB synthetic file, 1..CPU processes
+    python ReadFilesBenchmark.py --size-mb 2048 --processes 1 2 4 8 16 32
+    python ReadFilesBenchmark.py --append 100000   # buffered writer against one open per append
+    python ReadFilesBenchmark.py --suite           # every strategy on 1 MB .. 10 GB files, JSON baseline
+    python ReadFilesBenchmark.py --suite --sizes-mb 1 100 --density 0.01 --non-ascii 0.2
+    python ReadFilesBenchmark.py --count-many --file demo_file.txt   # count_many against one str.count per pattern
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import time
+from datetime import datetime
+
+from BenchmarkUtils import get_result, peak_rss_mb
+from W3Activity1 import ReadFiles
+from W3Activity2 import ReadFiles as AppendReadFiles
+
+# Default file sizes of the suite, from 1 MB to 10 GB
+DEFAULT_SUITE_SIZES_MB = [1, 10, 100, 1024, 10240]
+# Every counting strategy of the suite, by name, and the ReadFiles method it runs
+STRATEGIES = {
+    "whole_file": "count_asterisks",
+    "streaming": "count_asterisks_streaming",
+    "mmap": "count_asterisks_mmap",
+    "parallel": "count_asterisks_parallel",
+    "histogram": "count_from_histogram",
+}
+# whole_file reads the whole file into one str, so by default it is skipped above this size
+DEFAULT_MAX_WHOLE_FILE_MB = 2048
+# Patterns of the count_many benchmark: every lower case letter and a few words
+COUNT_MANY_PATTERNS = list("abcdefghijklmnopqrstuvwxyz") + ["the", "and", "Baba Yaga", "ll", "ing", "*"]
+# Words with non-ASCII characters, mixed into the synthetic text
+NON_ASCII_WORDS = ["café", "naïve", "señor", "straße", "ёлка", "日本語", "한국어", "emoji😀"]
+
+
+def generate_text_file(file_path, size_mb, needle="*", density=0.001, seed=2025, non_ascii=0.0):
+    """
+    Write a synthetic text file for the benchmarks.
+
+    Args:
+        file_path (str): Path of the file to write
+        size_mb (int): Size of the file in MB
+        needle (str): The character to spread over the file
+        density (float): Share of the characters that are the needle
+        seed (int): Random seed, the same seed always gives the same file
+        non_ascii (float): Share of the words that have non-ASCII characters
+    """
+    rng = random.Random(seed)
+    words = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "log", "event"]
+    # Build one 1 MB block and write it again and again, it is much faster than random text
+    block = []
+    block_size = 0
+    while block_size < 1024 * 1024:
+        if rng.random() < density * 5:
+            word = needle
+        elif rng.random() < non_ascii:
+            word = rng.choice(NON_ASCII_WORDS)
+        else:
+            word = rng.choice(words)
+        block.append(word)
+        block_size += len(word.encode("utf-8")) + 1
+    block = " ".join(block).encode("utf-8")[:1024 * 1024 - 1]
+    # Cut at the last space, so no character is cut in half
+    block = block[:block.rfind(b" ")] + b"\n"
+    with open(file_path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def _timed(function, *args):
+    """Run a function once with its output hidden, and return (result, seconds)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+    return result, seconds
+
+
+def benchmark_parallel_scaling(file_path, character="*", process_counts=None):
+    """
+    Time count_asterisks_parallel() with a growing number of processes.
+
+    Args:
+        file_path (str): Path of the file to count
+        character (str): The character to count
+        process_counts (list): Numbers of processes to try, default is 1, 2, 4, ... CPU count
+
+    Returns:
+        list: One dict per run with processes, count, seconds, MB/s, speedup and efficiency
+    """
+    if process_counts is None:
+        process_counts = []
+        processes = 1
+        while processes < os.cpu_count():
+            process_counts.append(processes)
+            processes *= 2
+        process_counts.append(os.cpu_count())
+    size_mb = os.path.getsize(file_path) / 1024 / 1024
+    results = []
+    with ReadFiles(file_path) as read_files:
+        # Warm up the page cache, so the first run does not pay for the disk
+        _timed(read_files.count_asterisks_mmap, character)
+        for processes in process_counts:
+            count, seconds = _timed(read_files.count_asterisks_parallel, character, processes)
+            results.append({
+                "processes": processes,
+                "count": count,
+                "seconds": round(seconds, 3),
+                "mb_per_sec": round(size_mb / seconds, 1),
+            })
+    base = results[0]["seconds"] * results[0]["processes"]
+    for result in results:
+        result["speedup"] = round(base / result["seconds"], 2)
+        result["efficiency"] = round(result["speedup"] / result["processes"], 2)
+    return results
+
+
+def _io_counters():
+    """Return the I/O counters of this process (syscr, rchar, ...) from /proc, or {} if there is no /proc."""
+    try:
+        with open("/proc/self/io") as f:
+            return {name: int(value) for name, value in (line.split(": ") for line in f)}
+    except OSError:
+        return {}
+
+
+def _strategy_worker(strategy, file_path, character, queue):
+    """Run one strategy in a fresh process, so its peak RSS and syscalls are not mixed with other runs."""
+    read_files = ReadFiles(file_path)
+    method = getattr(read_files, STRATEGIES[strategy])
+    io_before = _io_counters()
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    count, seconds = _timed(method, character)
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    # The counters of the worker processes of "parallel" are added when they are joined
+    io_after = _io_counters()
+    read_files.close()
+    queue.put({
+        "count": count,
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "read_syscalls": io_after["syscr"] - io_before["syscr"] if io_after else None,
+        "bytes_read": io_after["rchar"] - io_before["rchar"] if io_after else None,
+        "page_faults": (usage_after.ru_minflt - usage_before.ru_minflt) + (usage_after.ru_majflt - usage_before.ru_majflt),
+    })
+
+
+def run_strategy(strategy, file_path, character="*"):
+    """
+    Run one counting strategy on one file in a child process.
+
+    Args:
+        strategy (str): Name of the strategy, one of STRATEGIES
+        file_path (str): Path of the file to count
+        character (str): The character to count
+
+    Returns:
+        dict: count, seconds, mb_per_sec, peak_rss_mb, read_syscalls, bytes_read and page_faults of the run
+
+    Raises:
+        RuntimeError: If the child process exits without a result
+    """
+    # spawn gives every run a clean interpreter, so the peak RSS only belongs to this run
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_strategy_worker, args=(strategy, file_path, character, queue))
+    process.start()
+    result = get_result(process, queue)
+    process.join()
+    size_mb = os.path.getsize(file_path) / 1024 / 1024
+    result["mb_per_sec"] = round(size_mb / result["seconds"], 1) if result["seconds"] else None
+    result["seconds"] = round(result["seconds"], 3)
+    return result
+
+
+def run_suite(sizes_mb=DEFAULT_SUITE_SIZES_MB, strategies=tuple(STRATEGIES), character="*", density=0.001,
+              non_ascii=0.0, directory=".", max_whole_file_mb=DEFAULT_MAX_WHOLE_FILE_MB, keep_files=False):
+    """
+    Run every strategy on a synthetic file of every size and collect the results.
+
+    The files are made once per size (and reused if they already exist), and
+    every file is counted once before the runs so the page cache is warm and
+    the runs compare the strategies, not the disk.
+
+    Args:
+        sizes_mb (list): Sizes of the synthetic files in MB
+        strategies (iterable): Names of the strategies to run
+        character (str): The character to count
+        density (float): Share of the characters that are the needle
+        non_ascii (float): Share of the words that have non-ASCII characters
+        directory (str): Directory for the synthetic files
+        max_whole_file_mb (int): Skip whole_file above this size, 0 means no limit
+        keep_files (bool): Keep the synthetic files after the runs
+
+    Returns:
+        dict: The benchmark baseline, ready to be saved as JSON
+    """
+    results = []
+    for size_mb in sizes_mb:
+        file_path = os.path.join(directory, f"benchmark_{size_mb}mb_{density}_{non_ascii}.txt")
+        if not os.path.exists(file_path):
+            generate_text_file(file_path, size_mb, character, density, non_ascii=non_ascii)
+        # Read the file once without mapping it, so the peak RSS of this process stays small
+        _timed(ReadFiles(file_path).count_asterisks_streaming, character)
+        for strategy in strategies:
+            if strategy == "whole_file" and max_whole_file_mb and size_mb > max_whole_file_mb:
+                results.append({"strategy": strategy, "size_mb": size_mb, "skipped": "larger than max_whole_file_mb"})
+                continue
+            try:
+                result = run_strategy(strategy, file_path, character)
+            except RuntimeError as e:
+                print(f"Error running {strategy} on {size_mb} MB: {e}")
+                results.append({"strategy": strategy, "size_mb": size_mb, "error": str(e)})
+                continue
+            result.update({"strategy": strategy, "size_mb": size_mb})
+            results.append(result)
+            print(f"{strategy:>10} | {size_mb:>6} MB | {result['mb_per_sec']:>8} MB/s | {result['peak_rss_mb']:>8} MB RSS | "
+                  f"{result['read_syscalls']} read syscalls | {result['page_faults']} page faults")
+        if not keep_files:
+            os.remove(file_path)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "character": character,
+        "density": density,
+        "non_ascii": non_ascii,
+        "results": results,
+    }
+
+
+def benchmark_count_many(file_path, patterns=COUNT_MANY_PATTERNS, runs=5):
+    """
+    Time count_many() against reading the file once and calling str.count for every pattern.
+
+    count_many() is timed on a new ReadFiles object (it reads the file and makes
+    the byte histogram) and again on the same object (the histogram is cached).
+    The best of runs is kept for every method.
+
+    Args:
+        file_path (str): Path of the file to count
+        patterns (list): The characters (or texts) to count
+        runs (int): Number of times every method is run
+
+    Returns:
+        list: One dict per method with method, seconds and speedup against the rescans
+    """
+    def rescans():
+        with open(file_path, encoding="utf-8") as f:
+            content = f.read()
+        return {pattern: content.count(pattern) for pattern in patterns}
+
+    read_files = ReadFiles(file_path)
+    methods = [
+        ("str.count per pattern", rescans),
+        ("count_many (new object)", lambda: ReadFiles(file_path).count_many(patterns)),
+        ("count_many (cached histogram)", lambda: read_files.count_many(patterns)),
+    ]
+    expected = rescans()
+    results = []
+    for method, function in methods:
+        counts, seconds = min((_timed(function) for _ in range(runs)), key=lambda run: run[1])
+        # No pattern of the benchmark can overlap itself, so the counts are the same as str.count
+        if counts != expected:
+            raise RuntimeError(f"{method} gave different counts")
+        results.append({"method": method, "seconds": round(seconds, 4)})
+    for result in results:
+        result["speedup"] = round(results[0]["seconds"] / result["seconds"], 2)
+    return results
+
+
+def benchmark_append(file_path, appends=10000, marker="*"):
+    """
+    Time appending markers one by one: append_char_to_file() (one open per call)
+    against the buffered writer with every fsync policy.
+
+    Args:
+        file_path (str): Path of a scratch file, it is emptied before every run
+        appends (int): Number of markers to append in every run
+        marker (str): The text of one marker
+
+    Returns:
+        list: One dict per run with method, appends, seconds and appends/sec
+    """
+    read_files = AppendReadFiles(file_path, "a")
+    runs = [("append_char_to_file", None)] + [(f"writer fsync={policy}", policy) for policy in ("never", "batch", "always")]
+    results = []
+    for method, policy in runs:
+        open(file_path, "w").close()
+        start = time.perf_counter()
+        if policy is None:
+            for _ in range(appends):
+                read_files.append_char_to_file(marker)
+        else:
+            with read_files.open_writer(fsync=policy) as writer:
+                for _ in range(appends):
+                    writer.append(marker)
+        seconds = time.perf_counter() - start
+        results.append({
+            "method": method,
+            "appends": appends,
+            "seconds": round(seconds, 3),
+            "appends_per_sec": round(appends / seconds),
+        })
+    os.remove(file_path)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the counting and appending of ReadFiles.")
+    parser.add_argument("--file", default="benchmark_file.txt", help="file to count, created if it does not exist")
+    parser.add_argument("--size-mb", type=int, default=256, help="size of the synthetic file in MB")
+    parser.add_argument("--character", default="*", help="character to count")
+    parser.add_argument("--processes", type=int, nargs="+", help="numbers of processes to try")
+    parser.add_argument("--append", type=int, metavar="N", help="benchmark N appends instead of counting")
+    parser.add_argument("--count-many", action="store_true", help="benchmark count_many against one str.count per pattern")
+    parser.add_argument("--suite", action="store_true", help="run every strategy on synthetic files of every size")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=DEFAULT_SUITE_SIZES_MB, help="file sizes of the suite")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES),
+                        help="strategies of the suite")
+    parser.add_argument("--density", type=float, default=0.001, help="share of the characters that are the needle")
+    parser.add_argument("--non-ascii", type=float, default=0.0, help="share of the words with non-ASCII characters")
+    parser.add_argument("--max-whole-file-mb", type=int, default=DEFAULT_MAX_WHOLE_FILE_MB,
+                        help="skip the whole-file strategy above this size, 0 means no limit")
+    parser.add_argument("--keep-files", action="store_true", help="keep the synthetic files of the suite")
+    parser.add_argument("--output", default="readfiles_baseline.json", help="JSON file to save the suite baseline")
+    args = parser.parse_args()
+
+    if args.suite:
+        print("=" * 60)
+        print(f"ReadFiles counting strategies, '{args.character}' density {args.density}, non-ASCII {args.non_ascii}")
+        print("=" * 60)
+        baseline = run_suite(args.sizes_mb, args.strategies, args.character, args.density, args.non_ascii,
+                             max_whole_file_mb=args.max_whole_file_mb, keep_files=args.keep_files)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print("=" * 60)
+        print(f"Baseline saved to {args.output}")
+        raise SystemExit
+
+    if args.append:
+        print("=" * 60)
+        print(f"Appending {args.append} markers")
+        print("=" * 60)
+        for result in benchmark_append("benchmark_append.txt", args.append):
+            print(f"{result['method']:>22} | {result['seconds']:>8} s | {result['appends_per_sec']:>10} appends/sec")
+        print("=" * 60)
+        raise SystemExit
+
+    if args.count_many:
+        if not os.path.exists(args.file):
+            print(f"Generating {args.size_mb} MB synthetic file: {args.file}")
+            generate_text_file(args.file, args.size_mb, args.character)
+        print("=" * 60)
+        print(f"Counting {len(COUNT_MANY_PATTERNS)} patterns in {args.file}")
+        print("=" * 60)
+        for result in benchmark_count_many(args.file):
+            print(f"{result['method']:>30} | {result['seconds']:>8} s | speedup {result['speedup']:>5}")
+        print("=" * 60)
+        raise SystemExit
+
+    if not os.path.exists(args.file):
+        print(f"Generating {args.size_mb} MB synthetic file: {args.file}")
+        generate_text_file(args.file, args.size_mb, args.character)
+    print("=" * 60)
+    print(f"Parallel counting of '{args.character}' in {args.file}")
+    print("=" * 60)
+    for result in benchmark_parallel_scaling(args.file, args.character, args.processes):
+        print(f"{result['processes']:>3} processes | {result['seconds']:>8} s | {result['mb_per_sec']:>8} MB/s | "
+              f"speedup {result['speedup']:>5} | efficiency {result['efficiency']:>4}")
+    print("=" * 60)
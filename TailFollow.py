@@ -0,0 +1,186 @@
+"""
+This file is used to follow a growing log file (like tail -f) and keep running
+counts of characters or texts, reading only the bytes appended since the last poll.
+@author: Yaohui Zhang @tomie
+
+Usage:
+    python TailFollow.py            # demo: a writer process appends and rotates a log while it is followed
+"""
+
+import os
+import time
+from multiprocessing import Process
+
+from W3Activity1 import DEFAULT_CHUNK_SIZE, _count_step, detect_compression
+
+# Default number of seconds between two polls of the file
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+class TailFollower:
+    """
+    Follow a file that grows and count characters (or texts) in the new bytes only.
+
+    The file is kept open between polls and the offset of the last byte read is
+    remembered, so every poll reads only what was appended. The counts are made
+    on the UTF-8 bytes, and the few bytes that could start a match split between
+    two polls are kept, so the counts are the same as str.count on the whole file.
+
+    Only plain files can be followed: the offsets of a compressed file are not
+    offsets of its text, so a gzip, bz2 or xz file raises ValueError.
+
+    Log rotation is detected by the path pointing to another file (a new inode)
+    or by the file getting smaller (truncated in place). The rest of the old file
+    is read first, then the new file is followed from its start. The counts keep
+    running over all the files.
+    """
+    def __init__(self, file_path, patterns, from_start=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the follower. The file is opened on the first poll.
+
+        Args:
+            file_path (str): Path to the file to follow
+            patterns (iterable): The characters (or texts) to count
+            from_start (bool): Count what is already in the file, otherwise only what is appended
+            chunk_size (int): Number of bytes to read at a time
+        """
+        self.file_path = file_path
+        self.patterns = list(dict.fromkeys(patterns))
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("The patterns to count must not be empty")
+        self.needles = [pattern.encode('utf-8') for pattern in self.patterns]
+        self.from_start = from_start
+        self.chunk_size = chunk_size
+        # Running count of every pattern since the follower started
+        self.counts = dict.fromkeys(self.patterns, 0)
+        # Offset of the next byte to read in the followed file
+        self.offset = 0
+        # Number of rotations (or truncations) seen so far
+        self.rotations = 0
+        self.file = None
+        # (device, inode) of the open file, None before the first open
+        self.identity = None
+        self._reset_carries()
+
+    def __enter__(self):
+        """Enables the use of 'with' statement, the file is closed at the end."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Closes the file when exiting the 'with' block."""
+        self.close()
+
+    def close(self):
+        """Close the followed file, if it is open."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _reset_carries(self):
+        """Forget the partial matches, a new file does not continue the old one."""
+        self.carries = [b''] * len(self.needles)
+
+    def _open(self):
+        """Open the file; the first time, skip what is already there unless from_start is True."""
+        skip_existing = self.identity is None and not self.from_start
+        if detect_compression(self.file_path) is not None:
+            raise ValueError(f"Can not follow the compressed file '{self.file_path}'")
+        self.file = open(self.file_path, 'rb')
+        stat = os.fstat(self.file.fileno())
+        self.identity = (stat.st_dev, stat.st_ino)
+        self.offset = stat.st_size if skip_existing else 0
+        self.file.seek(self.offset)
+
+    def _read_new(self, new_counts):
+        """Read from the offset to the end of the open file and add the matches to new_counts."""
+        while True:
+            data = self.file.read(self.chunk_size)
+            if not data:
+                return
+            self.offset += len(data)
+            for index, needle in enumerate(self.needles):
+                found, self.carries[index] = _count_step(self.carries[index], data, needle)
+                new_counts[self.patterns[index]] += found
+
+    def poll(self):
+        """
+        Read the bytes appended since the last poll and update the running counts.
+
+        Returns:
+            dict: pattern -> number of new matches found by this poll
+        """
+        new_counts = dict.fromkeys(self.patterns, 0)
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            # Between the rotation and the creation of the new file
+            stat = None
+        if self.file is not None:
+            if stat is None or (stat.st_dev, stat.st_ino) != self.identity:
+                # Rotated: finish the old file, which may have got more bytes before the rotation
+                self._read_new(new_counts)
+                self.close()
+                self._reset_carries()
+                self.rotations += 1
+            elif stat.st_size < self.offset:
+                # Truncated in place (copytruncate): start again from the beginning
+                self.file.seek(0)
+                self.offset = 0
+                self._reset_carries()
+                self.rotations += 1
+        if self.file is None and stat is not None:
+            self._open()
+        if self.file is not None:
+            self._read_new(new_counts)
+        for pattern, count in new_counts.items():
+            self.counts[pattern] += count
+        return new_counts
+
+    def follow(self, poll_interval=DEFAULT_POLL_INTERVAL, duration=None):
+        """
+        Poll the file again and again, and give the new matches of every poll that found some.
+
+        Args:
+            poll_interval (float): Seconds between two polls
+            duration (float): Stop after this many seconds, None follows until the loop is stopped
+
+        Yields:
+            dict: pattern -> number of new matches; self.counts holds the running counts
+        """
+        end = None if duration is None else time.monotonic() + duration
+        while True:
+            new_counts = self.poll()
+            if any(new_counts.values()):
+                yield new_counts
+            if end is not None and time.monotonic() >= end:
+                return
+            time.sleep(poll_interval)
+
+
+def _demo_writer(file_path, lines, rotate_every, delay):
+    """Append lines with a '*' marker to a log, renaming it to <file>.1 every rotate_every lines."""
+    for line in range(1, lines + 1):
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(f"event {line} *\n")
+        if line % rotate_every == 0:
+            os.replace(file_path, f"{file_path}.1")
+        time.sleep(delay)
+
+
+if __name__ == "__main__":
+    # Follow a log while another process writes to it and rotates it
+    file_path = "follow_demo.log"
+    for path in (file_path, f"{file_path}.1"):
+        if os.path.exists(path):
+            os.remove(path)
+    lines = 200
+    writer = Process(target=_demo_writer, args=(file_path, lines, 75, 0.01))
+    writer.start()
+    with TailFollower(file_path, ['*']) as follower:
+        for new_counts in follower.follow(poll_interval=0.1, duration=lines * 0.01 + 1):
+            print(f"+{new_counts['*']} markers, {follower.counts['*']} in total, {follower.rotations} rotations")
+    writer.join()
+    print(f"Markers written: {lines}, markers counted: {follower.counts['*']}")
+    for path in (file_path, f"{file_path}.1"):
+        if os.path.exists(path):
+            os.remove(path)
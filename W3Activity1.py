@@ -1,3 +1,218 @@
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import mmap
+import os
+import re
+import sys
+from collections import Counter
+from multiprocessing import Pool
+
+import numpy as np
+
+from LineIndex import LineIndex
+from WordIndex import WordIndex
+
+# Default size of one chunk when a file is read piece by piece (1 MB)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Magic bytes at the start of a compressed file, and the module that decompresses it
+COMPRESSION_FORMATS = {
+    b"\x1f\x8b\x08": gzip,
+    **{b"BZh" + str(level).encode('ascii'): bz2 for level in range(1, 10)},
+    b"\xfd7zXZ\x00": lzma,
+}
+
+
+def detect_compression(file_path):
+    """
+    Find out if a file is compressed from its first bytes, whatever its name is.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        module: gzip, bz2 or lzma for a compressed file, None for a plain file
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    for magic, module in COMPRESSION_FORMATS.items():
+        if head.startswith(magic):
+            return module
+    return None
+
+
+def open_input(file_path):
+    """
+    Open a file to read bytes, decompressing it on the fly if it is compressed.
+
+    The decompressor works chunk by chunk, so reading a compressed file with
+    read(size) uses bounded memory and no temporary file is written.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        file object: A binary file object giving the (decompressed) bytes
+    """
+    module = detect_compression(file_path)
+    if module is None:
+        return open(file_path, 'rb')
+    return module.open(file_path, 'rb')
+
+
+def _count_step(carry, chunk, needle):
+    """
+    Count the non-overlapping occurrences of needle in the next chunk of a text.
+
+    Args:
+        carry (str or bytes): The tail kept from the previous chunk
+        chunk (str or bytes): The next chunk
+        needle (str or bytes): The text to count, must not be empty
+
+    Returns:
+        tuple: (number of occurrences, tail to keep for the next chunk)
+    """
+    text = carry + chunk
+    if len(needle) == 1:
+        # A single character can not cross two chunks
+        return text.count(needle), needle[:0]
+    # Scan left to right like str.count does, and remember where the last match ended
+    count = 0
+    position = 0
+    while True:
+        found = text.find(needle, position)
+        if found == -1:
+            break
+        count += 1
+        position = found + len(needle)
+    # Keep the tail that could still be the start of a match in the next chunk
+    return count, text[max(position, len(text) - len(needle) + 1):]
+
+
+def _count_in_chunks(chunks, needle):
+    """
+    Count the non-overlapping occurrences of needle in a sequence of chunks,
+    with the same result as joining the chunks and calling .count(needle).
+
+    Works for str chunks with a str needle and for bytes chunks with a bytes needle.
+    Only the few characters that can start a match across two chunks are kept
+    between chunks, so the memory does not depend on the number of chunks.
+
+    Args:
+        chunks (iterable): The chunks, in order
+        needle (str or bytes): The text to count, must not be empty
+
+    Returns:
+        int: The number of occurrences of needle
+    """
+    if not needle:
+        raise ValueError("The text to count must not be empty")
+    count = 0
+    carry = needle[:0]
+    for chunk in chunks:
+        found, carry = _count_step(carry, chunk, needle)
+        count += found
+    return count
+
+
+def _has_self_overlap(needle):
+    """
+    Check if two matches of needle can overlap, e.g. 'aa' in 'aaa' or 'aba' in 'ababa'.
+
+    Args:
+        needle (str or bytes): The text to check
+
+    Returns:
+        bool: True if a proper prefix of needle is also a suffix of it
+    """
+    return any(needle[:size] == needle[-size:] for size in range(1, len(needle)))
+
+
+def _count_overlapping_step(carry, chunk, needle):
+    """
+    Count every occurrence of needle in the next chunk of a text, overlapping ones too
+    (e.g. 'aa' is found twice in 'aaa').
+
+    Args:
+        carry (str): The tail kept from the previous chunk
+        chunk (str): The next chunk
+        needle (str): The text to count, must not be empty
+
+    Returns:
+        tuple: (number of occurrences, tail to keep for the next chunk)
+    """
+    text = carry + chunk
+    if _has_self_overlap(needle):
+        # The lookahead matches an empty string at every start of needle, so the
+        # regex engine finds the overlapping matches at C speed
+        count = len(re.findall(f"(?={re.escape(needle)})", text))
+    else:
+        # Two matches can not overlap, so str.count finds all of them
+        count = text.count(needle)
+    # A match that starts in the last len(needle) - 1 characters is not complete yet,
+    # it is counted with the next chunk
+    return count, text[max(0, len(text) - len(needle) + 1):]
+
+
+def _has_newline(text):
+    """
+    Check if a text has '\r' or '\n', which a file read in text mode translates.
+
+    Args:
+        text (str): The text to check
+
+    Returns:
+        bool: True if the raw bytes of the file can not be counted for this text
+    """
+    return '\r' in text or '\n' in text
+
+
+def _align_to_character(mapped, position):
+    """
+    Move a byte position forward to the start of a UTF-8 character.
+
+    UTF-8 continuation bytes look like 10xxxxxx, so we skip them.
+
+    Args:
+        mapped (mmap.mmap): The mapped file
+        position (int): Any byte position
+
+    Returns:
+        int: The first character start at or after position
+    """
+    while position < len(mapped) and mapped[position] & 0xC0 == 0x80:
+        position += 1
+    return position
+
+
+def _count_range(file_path, start, end, needle, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count the matches of needle that start in the byte range [start, end) of a file.
+
+    Runs in a worker process, so it maps the file itself. The range is read
+    len(needle) - 1 bytes past its end, so a match that crosses into the next
+    range is counted by the range where it starts.
+
+    Args:
+        file_path (str): Path to the file
+        start (int): First byte of the range
+        end (int): First byte after the range
+        needle (bytes): The UTF-8 bytes to count
+        chunk_size (int): Number of bytes to count at a time
+
+    Returns:
+        int: The number of matches
+    """
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            stop = min(end + len(needle) - 1, len(mapped))
+            chunks = (mapped[position:min(position + chunk_size, stop)]
+                      for position in range(start, stop, chunk_size))
+            return _count_in_chunks(chunks, needle)
+
+
 class ReadFiles:
     """
     A class to read files and perform various operations on file content.
@@ -14,7 +229,72 @@ class ReadFiles:
         self.mode = mode
         self.file = None
         self.content = None
+        # Memory map of the file, created on first use and reused by later calls
+        self._mmap = None
+        # Cached histograms, with the (size, mtime) of the file they were made from
+        self._byte_histogram = None
+        self._char_histogram = None
+        self._histogram_stamp = None
+        # Line index of the file, loaded on the first read_lines()
+        self._line_index = None
+        # Word index of the file, loaded on the first search_words()
+        self._word_index = None
     
+    def __enter__(self):
+        """Enables the use of 'with' statement, the memory map is released at the end."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Releases the memory map when exiting the 'with' block."""
+        self.close()
+
+    def close(self):
+        """Releases the memory maps of the file, if there are any."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._line_index is not None:
+            self._line_index.close()
+
+    def _get_mmap(self):
+        """
+        Return a read-only memory map of the file, reusing the existing one.
+
+        The map is created again if the file size has changed since it was mapped.
+
+        Returns:
+            mmap.mmap: The memory map, or None for an empty file (an empty file can not be mapped)
+        """
+        size = os.path.getsize(self.file_path)
+        if self._mmap is not None and len(self._mmap) == size:
+            return self._mmap
+        self.close()
+        if size == 0:
+            return None
+        with open(self.file_path, 'rb') as self.file:
+            # The map keeps its own handle, so the file can be closed right away
+            self._mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _mmap_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Slice the memory map of the file into chunks of bytes.
+
+        Yields:
+            bytes: One chunk of the mapped file
+        """
+        mapped = self._get_mmap()
+        if mapped is None:
+            return
+        for start in range(0, len(mapped), chunk_size):
+            yield mapped[start:start + chunk_size]
+
+    def _open_text(self):
+        """Open the file as text with self.mode, through a decompressor if the file is compressed."""
+        if detect_compression(self.file_path) is None:
+            return open(self.file_path, self.mode, encoding='utf-8')
+        return io.TextIOWrapper(open_input(self.file_path), encoding='utf-8')
+
     def read_and_output(self):
         """
         Read the file content and print it to the console.
@@ -24,7 +304,7 @@ class ReadFiles:
         """
         try:
             # Open and read the file
-            with open(self.file_path, self.mode, encoding='utf-8') as self.file:
+            with self._open_text() as self.file:
                 self.content = self.file.read()
             
             # Print the file content with separators
@@ -42,6 +322,123 @@ class ReadFiles:
             print(f"Error reading file: {e}")
             return None
     
+    def read_and_output_streaming(self, chunk_size=DEFAULT_CHUNK_SIZE, page_lines=None, keep_content=False):
+        """
+        Print the file to the console chunk by chunk, optionally one page at a time.
+
+        Only one chunk is in memory at a time, so large files start printing at once.
+        With page_lines, the output stops after every page_lines lines and waits for
+        Enter (or 'q' to stop).
+
+        Args:
+            chunk_size (int): Number of bytes to read at a time
+            page_lines (int): Number of lines of one page, None prints without stopping
+            keep_content (bool): Also keep the whole content in self.content
+
+        Returns:
+            str: The content of the file if keep_content is True, otherwise None
+        """
+        try:
+            output = sys.stdout
+            kept = [] if keep_content else None
+            lines_left = page_lines
+            finished = True
+            print("=" * 60)
+            print(f"Content of file: {self.file_path}")
+            print("=" * 60)
+            for text in self._read_text_chunks(chunk_size):
+                if kept is not None:
+                    kept.append(text)
+                while text and page_lines:
+                    # Find the newline that ends the current page
+                    end = -1
+                    for _ in range(lines_left):
+                        end = text.find("\n", end + 1)
+                        if end == -1:
+                            break
+                    if end == -1:
+                        lines_left -= text.count("\n")
+                        break
+                    output.write(text[:end + 1])
+                    text = text[end + 1:]
+                    lines_left = page_lines
+                    output.flush()
+                    if input("-- More -- (Enter for the next page, q to quit) ").strip().lower() == "q":
+                        finished = False
+                        break
+                if not finished:
+                    break
+                output.write(text)
+            output.write("\n")
+            print("=" * 60)
+            # Only keep the content if the whole file was read
+            if kept is not None and finished:
+                self.content = "".join(kept)
+                return self.content
+            return None
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return None
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return None
+
+    def read_lines(self, start, stop):
+        """
+        Read lines start..stop-1 of the file (counted from 0) without reading the rest of it.
+
+        The line index (<file>.lines) is built on first use, saved, and updated
+        with only the new bytes when the file grows.
+
+        Args:
+            start (int): First line
+            stop (int): Line after the last line
+
+        Returns:
+            list: The lines, without newlines
+        """
+        try:
+            if detect_compression(self.file_path) is not None:
+                raise ValueError("the line index needs an uncompressed file")
+            if self._line_index is None:
+                self._line_index = LineIndex(self.file_path)
+            return self._line_index.get_lines(start, stop)
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return []
+        except Exception as e:
+            print(f"Error reading lines: {e}")
+            return []
+
+    def search_words(self, query):
+        """
+        Find a word or a phrase in the file with the inverted word index.
+
+        The file is tokenized once and the index is saved as <file>.words, so
+        later searches (also from new ReadFiles objects) do not scan the text.
+        The index is built again when the file changes.
+
+        Args:
+            query (str): One or more words, any case, e.g. "Baba Yaga"
+
+        Returns:
+            numpy.ndarray: The word positions where the matches start
+        """
+        try:
+            if detect_compression(self.file_path) is not None:
+                raise ValueError("the word index needs an uncompressed file")
+            if self._word_index is None or not self._word_index.is_current():
+                self._word_index = WordIndex(self.file_path)
+            matches = self._word_index.search(query)
+            print(f"\nNumber of matches of '{query}' in '{self.file_path}': {len(matches)}")
+            return matches
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return np.empty(0, dtype=np.uint32)
+        except Exception as e:
+            print(f"Error searching words: {e}")
+            return np.empty(0, dtype=np.uint32)
+
     def count_asterisks(self,character):
         """
         Count the number of '*' characters in the file.
@@ -54,7 +451,7 @@ class ReadFiles:
             # If content hasn't been read yet, read it first
             # the third parameter is the encoding of the file
             if self.content is None:
-                with open(self.file_path, self.mode, encoding='utf-8') as self.file:
+                with self._open_text() as self.file:
                     self.content = self.file.read()
             
             # Count the '*' characters
@@ -71,6 +468,291 @@ class ReadFiles:
             print(f"Error counting asterisks: {e}")
             return 0
 
+    def count_asterisks_mmap(self, character, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Count the number of '*' characters in the file through a memory map.
+
+        An ASCII character is counted on the raw bytes with bytes.count, without
+        decoding the file: in UTF-8 an ASCII byte is never part of another character.
+        Other characters are counted on text decoded from the map chunk by chunk.
+        A text with '\r' or '\n' is counted with count_asterisks_streaming(), which
+        translates the newlines like count_asterisks() does.
+        The memory map is kept and reused by the next call, use close() (or a
+        'with' block) to release it.
+
+        Args:
+            character (str): The character (or text) to count
+            chunk_size (int): Number of bytes to count at a time
+
+        Returns:
+            int: The number of characters in the file
+        """
+        try:
+            if detect_compression(self.file_path) is not None or _has_newline(character):
+                # A compressed file can not be mapped, stream it through the decompressor;
+                # the raw bytes of the map are not newline-translated
+                return self.count_asterisks_streaming(character, chunk_size)
+            if character.isascii():
+                asterisk_count = _count_in_chunks(self._mmap_chunks(chunk_size), character.encode('ascii'))
+            else:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                text_chunks = (decoder.decode(chunk) for chunk in self._mmap_chunks(chunk_size))
+                asterisk_count = _count_in_chunks(text_chunks, character)
+                # Raise an error if the file ends in the middle of a character
+                decoder.decode(b'', final=True)
+            print(f"\nNumber of {character} characters in '{self.file_path}': {asterisk_count}")
+            return asterisk_count
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return 0
+        except Exception as e:
+            print(f"Error counting asterisks: {e}")
+            return 0
+
+    def count_asterisks_parallel(self, character, processes=None):
+        """
+        Count the number of '*' characters in the file with several processes.
+
+        The file is split into one byte range per process, every split point is
+        moved to the start of a UTF-8 character, and every process counts its range
+        through its own memory map. The counts of all ranges are added up.
+
+        UTF-8 is self-synchronizing, so counting the UTF-8 bytes of the character
+        gives the same count as counting the decoded text. For a text whose matches
+        can overlap (e.g. 'aa') or a text with '\r' or '\n', the ranges can not be
+        counted on their own, so it is counted with count_asterisks_mmap() instead.
+
+        Args:
+            character (str): The character (or text) to count
+            processes (int): Number of worker processes, default is the number of CPUs
+
+        Returns:
+            int: The number of characters in the file
+        """
+        try:
+            if (_has_self_overlap(character) or _has_newline(character)
+                    or detect_compression(self.file_path) is not None):
+                return self.count_asterisks_mmap(character)
+            processes = processes or os.cpu_count()
+            mapped = self._get_mmap()
+            if mapped is None:
+                asterisk_count = 0
+            else:
+                size = len(mapped)
+                splits = [_align_to_character(mapped, size * part // processes) for part in range(processes)]
+                splits.append(size)
+                needle = character.encode('utf-8')
+                ranges = [(self.file_path, splits[part], splits[part + 1], needle)
+                          for part in range(processes) if splits[part] < splits[part + 1]]
+                with Pool(len(ranges)) as pool:
+                    asterisk_count = sum(pool.starmap(_count_range, ranges))
+            print(f"\nNumber of {character} characters in '{self.file_path}': {asterisk_count}")
+            return asterisk_count
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return 0
+        except Exception as e:
+            print(f"Error counting asterisks: {e}")
+            return 0
+
+    def count_many(self, patterns, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Count many characters or texts in one pass over the file.
+
+        A single ASCII character (not '\r' or '\n') is read from the byte
+        histogram, made with numpy and cached. Every other pattern is counted with
+        str.count (or a regex lookahead when its matches can overlap) on every
+        chunk of text. When both are needed, the byte histogram is made from the
+        same chunks, so the file is read once and each pattern is scanned at C speed.
+        If the content has already been read it is scanned instead of the file.
+        Overlapping matches are all counted (unlike str.count).
+
+        Args:
+            patterns (iterable): The characters (or texts) to count
+            chunk_size (int): Number of bytes to read at a time when streaming
+
+        Returns:
+            dict: pattern -> number of matches in the file
+        """
+        try:
+            patterns = list(dict.fromkeys(patterns))
+            if any(not pattern for pattern in patterns):
+                raise ValueError("The patterns to count must not be empty")
+            counts = dict.fromkeys(patterns, 0)
+            if self.content is None:
+                stat = os.stat(self.file_path)
+                bytes_counted = [pattern for pattern in patterns
+                                 if len(pattern) == 1 and pattern.isascii() and not _has_newline(pattern)]
+            else:
+                bytes_counted = []
+            scanned = [pattern for pattern in patterns if pattern not in bytes_counted]
+            byte_histogram = None
+            if scanned:
+                if self.content is not None:
+                    texts = [self.content]
+                elif bytes_counted and self._histogram_stamp != (stat.st_size, stat.st_mtime_ns):
+                    # Make the byte histogram from the chunks read for the text, not in a second read
+                    byte_histogram = np.zeros(256, dtype=np.int64)
+                    texts = self._read_text_chunks(chunk_size, byte_histogram)
+                else:
+                    texts = self._read_text_chunks(chunk_size)
+                carries = dict.fromkeys(scanned, "")
+                for text in texts:
+                    for pattern in scanned:
+                        found, carries[pattern] = _count_overlapping_step(carries[pattern], text, pattern)
+                        counts[pattern] += found
+            if byte_histogram is not None:
+                # Cache it with the stamp from before the read, a file changed since is counted again
+                self._byte_histogram = byte_histogram
+                self._char_histogram = None
+                self._histogram_stamp = (stat.st_size, stat.st_mtime_ns)
+            elif bytes_counted:
+                byte_histogram = self.histogram()
+            for pattern in bytes_counted:
+                counts[pattern] = int(byte_histogram[ord(pattern)])
+            for pattern, count in counts.items():
+                print(f"Number of {pattern} characters in '{self.file_path}': {count}")
+            return counts
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return {}
+        except Exception as e:
+            print(f"Error counting patterns: {e}")
+            return {}
+
+    def histogram(self, unicode=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Count every byte (or every character) of the file in one pass.
+
+        The byte histogram has 256 bins and is made with numpy.bincount on chunks
+        of the memory map, without decoding the file, so it counts the raw '\r'
+        and '\n' bytes. bincount works on an int copy of every chunk (8 bytes per
+        byte), so the chunks are kept small. With unicode=True a histogram of the
+        decoded characters (code points) is made as well, with the newlines
+        translated like count_asterisks() does.
+        Both are cached until the file changes, so count_from_histogram() is O(1).
+
+        Args:
+            unicode (bool): Also make the histogram of the decoded characters
+            chunk_size (int): Number of bytes to count at a time
+
+        Returns:
+            numpy.ndarray or collections.Counter: The byte histogram (256 counts),
+            or the character histogram if unicode is True
+        """
+        try:
+            stat = os.stat(self.file_path)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            if stamp != self._histogram_stamp:
+                self._byte_histogram = None
+                self._char_histogram = None
+                self._histogram_stamp = stamp
+            if self._byte_histogram is None:
+                byte_histogram = np.zeros(256, dtype=np.int64)
+                mapped = None if detect_compression(self.file_path) is not None else self._get_mmap()
+                if mapped is None:
+                    # A compressed file is counted on the decompressed bytes, one chunk at a time
+                    with open_input(self.file_path) as self.file:
+                        for data in iter(lambda: self.file.read(chunk_size), b''):
+                            byte_histogram += np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+                else:
+                    for start in range(0, len(mapped), chunk_size):
+                        # A numpy view of the map, the chunk is only copied by bincount
+                        chunk = np.frombuffer(mapped, dtype=np.uint8, count=min(chunk_size, len(mapped) - start), offset=start)
+                        byte_histogram += np.bincount(chunk, minlength=256)
+                        # Release the view, an mmap can not be closed while a view is alive
+                        del chunk
+                self._byte_histogram = byte_histogram
+            if not unicode:
+                return self._byte_histogram
+            if self._char_histogram is None:
+                char_histogram = Counter()
+                for text in self._read_text_chunks(chunk_size):
+                    char_histogram.update(text)
+                self._char_histogram = char_histogram
+            return self._char_histogram
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+        except Exception as e:
+            print(f"Error making the histogram: {e}")
+        return Counter() if unicode else np.zeros(256, dtype=np.int64)
+
+    def count_from_histogram(self, character):
+        """
+        Count one character with the cached histogram.
+
+        An ASCII character is read from the byte histogram (made on first use).
+        Other characters, and '\r' and '\n' (whose bytes are not newline-translated),
+        need the character histogram, which is made on first use.
+
+        Args:
+            character (str): One character
+
+        Returns:
+            int: The number of times the character is in the file
+        """
+        if len(character) != 1:
+            raise ValueError("count_from_histogram() counts a single character, use count_many() for text")
+        if character.isascii() and not _has_newline(character):
+            return int(self.histogram()[ord(character)])
+        return self.histogram(unicode=True)[character]
+
+    def _read_text_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, byte_histogram=None):
+        """
+        Read the file as text, one chunk at a time.
+
+        The file is read in binary and decoded with an incremental UTF-8 decoder,
+        so a multibyte character split between two chunks is decoded correctly.
+        '\r\n' and '\r' are translated to '\n' like a file opened in text mode
+        (also when a '\r\n' is split between two chunks), so the text is the same
+        as what count_asterisks() reads. A gzip, bz2 or xz file is decompressed on the fly.
+
+        Args:
+            chunk_size (int): Number of bytes to read at a time
+            byte_histogram (numpy.ndarray): If given, the (decompressed) bytes of
+                every chunk are added to these 256 counts as well
+
+        Yields:
+            str: The decoded text of every chunk
+        """
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+        with open_input(self.file_path) as self.file:
+            while True:
+                data = self.file.read(chunk_size)
+                if not data:
+                    break
+                if byte_histogram is not None:
+                    byte_histogram += np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+                yield decoder.decode(data)
+        # Raise an error if the file ends in the middle of a character
+        yield decoder.decode(b'', final=True)
+
+    def count_asterisks_streaming(self, character, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Count the number of '*' characters in the file without reading the whole file.
+
+        The file is counted chunk by chunk, so the peak memory only depends on
+        chunk_size and not on the size of the file. The count is the same as
+        count_asterisks(), and self.content is not filled.
+
+        Args:
+            character (str): The character (or text) to count
+            chunk_size (int): Number of bytes to read at a time
+
+        Returns:
+            int: The number of characters in the file
+        """
+        try:
+            asterisk_count = _count_in_chunks(self._read_text_chunks(chunk_size), character)
+            print(f"\nNumber of {character} characters in '{self.file_path}': {asterisk_count}")
+            return asterisk_count
+        except FileNotFoundError:
+            print(f"Error: File '{self.file_path}' not found!")
+            return 0
+        except Exception as e:
+            print(f"Error counting asterisks: {e}")
+            return 0
+
 
 if __name__ == "__main__":
     # File path
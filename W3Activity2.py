@@ -1,84 +1,330 @@
-class ReadFiles:
+import hashlib
+import json
+import os
+import threading
+import time
+
+from W3Activity1 import DEFAULT_CHUNK_SIZE, _count_step, _has_newline, detect_compression
+from W3Activity1 import ReadFiles as BaseReadFiles
+from TailFollow import DEFAULT_POLL_INTERVAL, TailFollower
+
+# Number of bytes at the start of the file used to check that it was only appended to
+HEAD_SIZE = 64 * 1024
+# When AppendWriter calls os.fsync: never, once per flushed batch, or after every append
+FSYNC_POLICIES = ("never", "batch", "always")
+
+
+def _count_from(file, start, needle, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count the non-overlapping matches of needle in an open binary file, from a byte offset.
+
+    Args:
+        file: The file, opened in binary mode
+        start (int): Byte offset to start counting from
+        needle (bytes): The UTF-8 bytes to count
+        chunk_size (int): Number of bytes to read at a time
+
+    Returns:
+        tuple: (count, resume) where resume is the byte offset to continue
+        counting from when more bytes are appended to the file
+    """
+    file.seek(start)
+    count = 0
+    carry = b''
+    # Byte offset of the first byte of carry
+    carry_start = start
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        found, next_carry = _count_step(carry, chunk, needle)
+        count += found
+        carry_start += len(carry) + len(chunk) - len(next_carry)
+        carry = next_carry
+    return count, carry_start
+
+
+class CountIndex:
     """
-    A class to read files and perform various operations on file content.
+    A sidecar index (<file>.counts.json) that keeps character counts of a file.
+
+    The index stores the size, the mtime and a hash of the first bytes of the file
+    (the first HEAD_SIZE bytes, or the whole file while it is smaller), made again
+    after every update:
+    - same size and mtime: the file has not changed, the cached counts are returned
+    - bigger and the same first bytes: the file was appended to, only the new tail is counted
+    - anything else: the file is counted again from the start
     """
-    def __init__(self, file_path, mode="r"):
+    def __init__(self, file_path, chunk_size=DEFAULT_CHUNK_SIZE):
         """
-        Initialize the ReadFiles object with file path and mode.
-        
+        Initialize the index and load the sidecar file if there is one.
+
         Args:
-            file_path (str): Path to the file to read
-            mode (str): File mode, default is 'r' (read mode)
+            file_path (str): Path to the file to index
+            chunk_size (int): Number of bytes to read at a time
         """
         self.file_path = file_path
-        self.mode = mode
-        self.file = None
-        self.content = None
-    
-    def read_and_output(self):
+        self.index_path = f"{file_path}.counts.json"
+        self.chunk_size = chunk_size
+        self.data = None
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # No index yet, or a broken one: it is built again on the first count
+            self.data = None
+
+    @staticmethod
+    def _head_hash(file, size):
+        """Return the sha256 of the first size bytes of an open binary file."""
+        file.seek(0)
+        return hashlib.sha256(file.read(size)).hexdigest()
+
+    def _save(self):
+        """Write the index next to the file, through a temporary file so it is never half written."""
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f)
+        os.replace(temporary_path, self.index_path)
+
+    def count(self, character):
         """
-        Read the file content and print it to the console.
-        
+        Return the number of non-overlapping matches of character in the file,
+        the same as ReadFiles.count_asterisks(), using the index when possible.
+        The raw bytes are counted, so a compressed file, or a text with '\r' or '\n'
+        (which text mode translates), raises ValueError.
+
+        Args:
+            character (str): The character (or text) to count
+
         Returns:
-            str: The content of the file
+            int: The number of matches
+        """
+        if not character:
+            raise ValueError("The text to count must not be empty")
+        if _has_newline(character):
+            raise ValueError("the count index counts raw bytes, '\\r' and '\\n' need count_asterisks_streaming()")
+        if detect_compression(self.file_path) is not None:
+            raise ValueError("the count index needs an uncompressed file")
+        stat = os.stat(self.file_path)
+        data = self.data
+        unchanged = data is not None and data["size"] == stat.st_size and data["mtime_ns"] == stat.st_mtime_ns
+        if unchanged and character in data["counts"]:
+            # Nothing has changed, the cached count is returned without reading the file
+            return data["counts"][character]["count"]
+        with open(self.file_path, 'rb') as file:
+            # A file that was only appended to is bigger and starts with the same bytes
+            appended = (not unchanged and data is not None and stat.st_size > data["size"]
+                        and self._head_hash(file, data["head_size"]) == data["head_hash"])
+            if appended:
+                # Only count the bytes after the last count of every character
+                for text, entry in data["counts"].items():
+                    tail_count, entry["resume"] = _count_from(file, entry["resume"], text.encode('utf-8'), self.chunk_size)
+                    entry["count"] += tail_count
+            elif not unchanged:
+                data = {"counts": {}}
+            if character not in data["counts"]:
+                count, resume = _count_from(file, 0, character.encode('utf-8'), self.chunk_size)
+                data["counts"][character] = {"count": count, "resume": resume}
+            if not unchanged:
+                # Hash the head of the file as it is now, an appended file has a longer head
+                # until it reaches HEAD_SIZE, so a later rewrite of those bytes is found
+                data["head_size"] = min(stat.st_size, HEAD_SIZE)
+                data["head_hash"] = self._head_hash(file, data["head_size"])
+        data["size"] = stat.st_size
+        data["mtime_ns"] = stat.st_mtime_ns
+        self.data = data
+        self._save()
+        return data["counts"][character]["count"]
+
+
+class AppendWriter:
+    """
+    A long-lived writer that appends text to a file through a buffer.
+
+    The file is opened once. Appends are collected in memory and written in one
+    batch when the buffer is full, when flush_interval seconds have passed (a
+    background thread checks it), or when flush()/close() is called.
+    """
+    def __init__(self, file_path, buffer_size=64 * 1024, flush_interval=1.0, fsync="never"):
+        """
+        Open the file for appending.
+
+        Args:
+            file_path (str): Path to the file to append to
+            buffer_size (int): Number of bytes to collect before writing a batch
+            flush_interval (float): Seconds after which a batch is written anyway, None to only flush by size
+            fsync (str): 'never', 'batch' (after every written batch) or 'always' (after every append)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy '{fsync}'. Please use one of: {', '.join(FSYNC_POLICIES)}.")
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._file = open(file_path, 'ab')
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        # The background thread and the caller both flush, so the buffer is shared under a lock
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_on_time, daemon=True)
+            self._flusher.start()
+
+    def __enter__(self):
+        """Enables the use of 'with' statement for resource management."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Writes what is left in the buffer and closes the file."""
+        self.close()
+
+    def _flush_on_time(self):
+        """Background thread: write the buffer once flush_interval has passed since the last write."""
+        while not self._closed.wait(self.flush_interval / 4):
+            if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def _write_buffer(self):
+        """Write the buffer as one batch. The lock must be held."""
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            self._buffer = []
+            self._buffered_bytes = 0
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def append(self, text):
+        """
+        Append text to the file (through the buffer).
+
+        Args:
+            text (str): The text to append
         """
+        data = text.encode('utf-8')
+        with self._lock:
+            if self._file.closed:
+                raise ValueError("The writer is closed")
+            self._buffer.append(data)
+            self._buffered_bytes += len(data)
+            if self.fsync == "always" or self._buffered_bytes >= self.buffer_size:
+                self._write_buffer()
+
+    def append_many(self, texts):
+        """
+        Append many texts at once.
+
+        Args:
+            texts (iterable): The texts to append, in order
+        """
+        data = [text.encode('utf-8') for text in texts]
+        with self._lock:
+            if self._file.closed:
+                raise ValueError("The writer is closed")
+            self._buffer.extend(data)
+            self._buffered_bytes += sum(len(item) for item in data)
+            if self.fsync == "always" or self._buffered_bytes >= self.buffer_size:
+                self._write_buffer()
+
+    def flush(self):
+        """Write everything in the buffer to the file now."""
+        with self._lock:
+            if not self._file.closed:
+                self._write_buffer()
+
+    def close(self):
+        """Write what is left in the buffer, stop the background thread and close the file."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._write_buffer()
+                self._file.close()
+
+
+class ReadFiles(BaseReadFiles):
+    """
+    ReadFiles (from W3Activity1) that can also append to the file and keep a count index.
+    """
+    def append_char_to_file(self, char):
+        """Appends a specific character to the end of the file."""
         try:
-            # Open and read the file
-            with open(self.file_path, self.mode, encoding='utf-8') as self.file:
-                self.content = self.file.read()
-            
-            # Print the file content with separators
-            print("=" * 60)
-            print(f"Content of file: {self.file_path}")
-            print("=" * 60)
-            print(self.content)
-            print("=" * 60)
-            
-            return self.content
-        except FileNotFoundError:
-            print(f"Error: File '{self.file_path}' not found!")
-            return None
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(char)
+            return f"Successfully appended '{char}' to {self.file_path}"
         except Exception as e:
-            print(f"Error reading file: {e}")
-            return None
-    
-    def count_asterisks(self,character):
+            return f"An error occurred while appending: {e}"
+
+    def open_writer(self, buffer_size=64 * 1024, flush_interval=1.0, fsync="never"):
         """
-        Count the number of '*' characters in the file.
-        
+        Open a buffered writer that appends to the file, for many appends per second.
+
+        Use it in a 'with' block (or call close()) so the last batch is written.
+        See AppendWriter for the arguments.
+
+        Returns:
+            AppendWriter: The writer
+        """
+        return AppendWriter(self.file_path, buffer_size, flush_interval, fsync)
+
+    def count_asterisks_cached(self, character):
+        """
+        Count the number of '*' characters in the file with the sidecar count index.
+
+        A file that has not changed is answered from the index without reading it,
+        an appended file only has its new tail counted, and any other change
+        counts the file again. The count is the same as count_asterisks().
+        A compressed file, or a text with '\r' or '\n', is counted with
+        count_asterisks_streaming(), which decompresses the file and translates
+        the newlines like count_asterisks() does.
+
         Returns:
-            int: The number of '*' characters in the file
+            int: The number of characters in the file
         """
-        #using try and except to handle the errors
         try:
-            # If content hasn't been read yet, read it first
-            # the third parameter is the encoding of the file
-            if self.content is None:
-                with open(self.file_path, self.mode, encoding='utf-8') as self.file:
-                    self.content = self.file.read()
-            
-            # Count the '*' characters
-            # the count is a built-in function in Python to count the number of occurrences of a substring in a string
-            asterisk_count = self.content.count(character)
+            if _has_newline(character) or detect_compression(self.file_path) is not None:
+                return self.count_asterisks_streaming(character)
+            asterisk_count = CountIndex(self.file_path).count(character)
             print(f"\nNumber of {character} characters in '{self.file_path}': {asterisk_count}")
             return asterisk_count
-        #handle the error if the file is not found
         except FileNotFoundError:
             print(f"Error: File '{self.file_path}' not found!")
             return 0
-        # handle the error if the file is not read
         except Exception as e:
             print(f"Error counting asterisks: {e}")
             return 0
 
-    def append_char_to_file(self, char):
-        """Appends a specific character to the end of the file."""
+    def follow(self, character, poll_interval=DEFAULT_POLL_INTERVAL, duration=None, from_start=True):
+        """
+        Follow the file as it grows (like tail -f) and print the running count of '*' characters.
+
+        Only the bytes appended since the last poll are read, and log rotation
+        is followed (see TailFollower).
+
+        Args:
+            character (str): The character (or text) to count
+            poll_interval (float): Seconds between two polls
+            duration (float): Stop after this many seconds, None follows until Ctrl+C
+            from_start (bool): Count what is already in the file, otherwise only what is appended
+
+        Returns:
+            int: The number of characters counted while following
+        """
+        follower = TailFollower(self.file_path, [character], from_start)
         try:
-            with open(self.filename, 'a', encoding='utf-8') as f:
-                f.write(char)
-            return f"Successfully appended '{char}' to {self.filename}"
+            for new_counts in follower.follow(poll_interval, duration):
+                print(f"+{new_counts[character]} {character} characters in '{self.file_path}', "
+                      f"{follower.counts[character]} in total")
+        except KeyboardInterrupt:
+            pass
         except Exception as e:
-            return f"An error occurred while appending: {e}"
+            print(f"Error following file: {e}")
+        finally:
+            follower.close()
+        return follower.counts[character]
 
 
 if __name__ == "__main__":
@@ -1,13 +1,187 @@
 import sqlite3
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Iterable
+
+# Number of rows sent to executemany at a time by the bulk insert methods
+BULK_CHUNK_SIZE = 10000
+# Number of enrollments moved per transaction by the data migration to the normalized schema
+MIGRATION_BATCH_SIZE = 10000
+# Default number of query results kept in the result cache (0 turns the cache off)
+QUERY_CACHE_SIZE = 1024
+# Marks a cache miss, since None or 0 can be a cached result
+_MISS = object()
+# Schema version from which Courses is a view of CourseCatalog and Enrollments
+NORMALIZED_VERSION = 4
+# Error of the catalog_name_check trigger
+COURSE_NAME_CONFLICT = "a course code has two different names"
+# A course code must keep one name: without this check INSERT OR IGNORE would keep
+# the first name and silently drop the other one
+CATALOG_NAME_CHECK_TRIGGER = f"""
+        CREATE TRIGGER IF NOT EXISTS catalog_name_check BEFORE INSERT ON CourseCatalog
+        WHEN EXISTS (SELECT 1 FROM CourseCatalog WHERE code = NEW.code AND name IS NOT NEW.name)
+        BEGIN
+            SELECT RAISE(ABORT, '{COURSE_NAME_CONFLICT}');
+        END
+        """
+
+# Schema migrations, in order: migration N brings the schema from version N-1 to N.
+# The version of a database is kept in PRAGMA user_version (0 for a new database).
+# Add a new list at the end for every schema change, never edit an applied one.
+# Every statement must be safe to run again (e.g. IF NOT EXISTS).
+# A migration can also be the name of a YooBee method, for data that is moved in
+# many small transactions: the method must be resumable and return True when done.
+MIGRATIONS = [
+    # 1: indexes for the course queries, so they do not scan the whole Courses table
+    [
+        # (code, student_id) also answers COUNT(DISTINCT student_id) without reading the table
+        "CREATE INDEX IF NOT EXISTS idx_courses_code_student ON Courses(code, student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_courses_teacher_id ON Courses(teacher_id)",
+        "CREATE INDEX IF NOT EXISTS idx_courses_student_id ON Courses(student_id)",
+    ],
+    # 2: normalized schema, every course is stored once and enrollments point to it
+    [
+        """
+        CREATE TABLE IF NOT EXISTS CourseCatalog (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            code VARCHAR UNIQUE NOT NULL,
+            name VARCHAR NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS Enrollments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            teacher_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            FOREIGN KEY (course_id) REFERENCES CourseCatalog(id),
+            FOREIGN KEY (teacher_id) REFERENCES Teachers(id),
+            FOREIGN KEY (student_id) REFERENCES Students(id)
+        )
+        """,
+        # Covering indexes: the course queries are answered from the index only
+        "CREATE INDEX IF NOT EXISTS idx_enrollments_course_student ON Enrollments(course_id, student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_enrollments_course_teacher ON Enrollments(course_id, teacher_id)",
+        "CREATE INDEX IF NOT EXISTS idx_enrollments_teacher_id ON Enrollments(teacher_id)",
+        "CREATE INDEX IF NOT EXISTS idx_enrollments_student_id ON Enrollments(student_id)",
+    ],
+    # 3: move the Courses rows in batches, the database can be used between the batches
+    "_migrate_enrollments",
+    # 4: copy the rows added since step 3, then replace the Courses table with a view
+    # of the same columns, so old queries still work and inserts go to the new tables
+    [
+        CATALOG_NAME_CHECK_TRIGGER,
+        """
+        INSERT OR IGNORE INTO CourseCatalog (code, name)
+        SELECT code, name FROM Courses
+        WHERE id > (SELECT COALESCE(MAX(id), 0) FROM Enrollments) ORDER BY id
+        """,
+        """
+        INSERT INTO Enrollments (id, course_id, teacher_id, student_id)
+        SELECT C.id, CC.id, C.teacher_id, C.student_id
+        FROM Courses AS C JOIN CourseCatalog AS CC ON CC.code = C.code
+        WHERE C.id > (SELECT COALESCE(MAX(id), 0) FROM Enrollments) ORDER BY C.id
+        """,
+        "DROP TABLE IF EXISTS Courses",
+        """
+        CREATE VIEW IF NOT EXISTS Courses AS
+        SELECT E.id, CC.code, CC.name, E.teacher_id, E.student_id
+        FROM Enrollments AS E JOIN CourseCatalog AS CC ON CC.id = E.course_id
+        """,
+        # INSERT INTO Courses keeps working: the course is added to the catalog once
+        # (not with INSERT OR IGNORE, which would also hide a NULL code or name)
+        """
+        CREATE TRIGGER IF NOT EXISTS courses_insert INSTEAD OF INSERT ON Courses
+        BEGIN
+            INSERT INTO CourseCatalog (code, name)
+            SELECT NEW.code, NEW.name WHERE NOT EXISTS (SELECT 1 FROM CourseCatalog WHERE code = NEW.code);
+            INSERT INTO Enrollments (course_id, teacher_id, student_id)
+            SELECT id, NEW.teacher_id, NEW.student_id FROM CourseCatalog WHERE code = NEW.code;
+        END
+        """,
+    ],
+    # 5: INSERT INTO Courses with a known code and another name is stopped, the
+    # trigger of migration 4 skipped the catalog insert and silently kept the old name
+    [
+        "DROP TRIGGER IF EXISTS courses_insert",
+        f"""
+        CREATE TRIGGER courses_insert INSTEAD OF INSERT ON Courses
+        BEGIN
+            SELECT RAISE(ABORT, '{COURSE_NAME_CONFLICT}')
+            WHERE EXISTS (SELECT 1 FROM CourseCatalog WHERE code = NEW.code AND name IS NOT NEW.name);
+            INSERT INTO CourseCatalog (code, name)
+            SELECT NEW.code, NEW.name WHERE NOT EXISTS (SELECT 1 FROM CourseCatalog WHERE code = NEW.code);
+            INSERT INTO Enrollments (course_id, teacher_id, student_id)
+            SELECT id, NEW.teacher_id, NEW.student_id FROM CourseCatalog WHERE code = NEW.code;
+        END
+        """,
+    ],
+]
+
+# The queries of get_students_count_for_course() and get_teachers_for_course()
+# before NORMALIZED_VERSION: the Courses table has every enrollment until migration 4
+# (migration 3 copies the rows, it does not remove them)
+LEGACY_STUDENTS_COUNT_QUERY = """
+        SELECT COUNT(DISTINCT student_id)
+        FROM Courses
+        WHERE code = ?
+        """
+LEGACY_TEACHERS_FOR_COURSE_QUERY = """
+        SELECT DISTINCT T.name
+        FROM Teachers AS T
+        JOIN Courses AS C ON T.id = C.teacher_id
+        WHERE C.code = ?
+        """
+# The same queries from NORMALIZED_VERSION on
+STUDENTS_COUNT_QUERY = """
+        SELECT COUNT(DISTINCT E.student_id)
+        FROM Enrollments AS E
+        JOIN CourseCatalog AS CC ON CC.id = E.course_id
+        WHERE CC.code = ?
+        """
+TEACHERS_FOR_COURSE_QUERY = """
+        SELECT DISTINCT T.name
+        FROM Teachers AS T
+        JOIN Enrollments AS E ON T.id = E.teacher_id
+        JOIN CourseCatalog AS CC ON CC.id = E.course_id
+        WHERE CC.code = ?
+        """
+# The tables every cached query reads: a write to one of them makes its results stale
+QUERY_TABLES = {
+    LEGACY_STUDENTS_COUNT_QUERY: {"Courses"},
+    LEGACY_TEACHERS_FOR_COURSE_QUERY: {"Teachers", "Courses"},
+    STUDENTS_COUNT_QUERY: {"Enrollments", "CourseCatalog"},
+    TEACHERS_FOR_COURSE_QUERY: {"Teachers", "Enrollments", "CourseCatalog"},
+}
+# The tables written by an insert into Courses: the table before migration 4,
+# then the tables behind the view (see the courses_insert trigger)
+COURSES_TABLES = ("Courses", "Enrollments", "CourseCatalog")
 
 class YooBee:
-    """A class to manage a simple university database (Students, Teachers, Courses) using SQLite."""
+    """A class to manage a simple university database (Students, Teachers, Courses) using SQLite.
+
+    Courses are stored once in CourseCatalog and every enrollment in Enrollments;
+    Courses is a view of both with the original columns (see MIGRATIONS).
+    """
 
-    def __init__(self, database_name: str) -> None:
-        """Initializes the database connection and cursor."""
+    def __init__(self, database_name: str, cache_size: int = QUERY_CACHE_SIZE, cache_ttl: float = None) -> None:
+        """
+        Initializes the database connection and cursor.
+
+        cache_size is the number of query results kept (least recently used first out),
+        cache_ttl the number of seconds a result is kept (None keeps it until a write).
+        """
         self.database_name = database_name
         self._conn = None  # Private attribute for database connection
         self._cursor = None  # Private attribute for database cursor
+        # Query result cache: (query, params) -> (result, expiry time or None, tables read)
+        # OrderedDict keeps the least recently used entry first
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        self._normalized = False
         try:
             # Establish a connection to the SQLite database
             self._conn = sqlite3.connect(database_name)
@@ -18,6 +192,10 @@ class YooBee:
             print(f"✓ Connected to database: {self.database_name}")
             # Automatically create tables when an instance is initialized
             self._create_tables()
+            # Bring an older database up to the latest schema
+            self._migrate()
+            # The course queries read the Courses table until the migration to the view is done
+            self._normalized = self.schema_version() >= NORMALIZED_VERSION
         except sqlite3.Error as e:
             print(f"Error connecting to database: {e}")
             # Ensure connection is closed if an error occurs during init
@@ -58,6 +236,124 @@ class YooBee:
             print(f"Database error: {e}")
             return None # Return None on error
 
+    def _cache_get(self, query: str, params: tuple):
+        """Returns the cached result of a query, or _MISS if it is not cached or has expired."""
+        if self._cache_size <= 0:
+            return _MISS
+        key = (query, params)
+        entry = self._cache.get(key)
+        if entry is None:
+            self._cache_stats["misses"] += 1
+            return _MISS
+        result, expires_at, _ = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._cache[key]
+            self._cache_stats["expirations"] += 1
+            self._cache_stats["misses"] += 1
+            return _MISS
+        # Mark the entry as the most recently used
+        self._cache.move_to_end(key)
+        self._cache_stats["hits"] += 1
+        return result
+
+    def _cache_put(self, query: str, params: tuple, result) -> None:
+        """Caches the result of a query, removing the least recently used entry if the cache is full."""
+        if self._cache_size <= 0:
+            return
+        expires_at = time.monotonic() + self._cache_ttl if self._cache_ttl is not None else None
+        self._cache[(query, params)] = (result, expires_at, QUERY_TABLES[query])
+        self._cache.move_to_end((query, params))
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+            self._cache_stats["evictions"] += 1
+
+    def _invalidate(self, *tables: str) -> None:
+        """Removes the cached results of the queries that read any of the written tables."""
+        written = set(tables)
+        stale = [key for key, (_, _, query_tables) in self._cache.items() if query_tables & written]
+        for key in stale:
+            del self._cache[key]
+        self._cache_stats["invalidations"] += len(stale)
+
+    def clear_cache(self) -> None:
+        """Empties the query result cache, e.g. after another program wrote to the database."""
+        self._cache_stats["invalidations"] += len(self._cache)
+        self._cache.clear()
+
+    def cache_stats(self) -> dict:
+        """Returns the cache counters (hits, misses, evictions, expirations, invalidations), size and hit rate."""
+        stats = dict(self._cache_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["size"] = len(self._cache)
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    # A wrap function to insert many rows in one transaction
+    def _bulk_insert(self, query: str, rows: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+        """
+        Inserts many rows with executemany inside one transaction, chunk by chunk.
+
+        Only one chunk of rows is in memory at a time, so rows can be a generator.
+        Every chunk runs inside a SAVEPOINT: if a row of the chunk breaks a
+        constraint (e.g. a duplicate email), only that chunk is rolled back and
+        inserted again row by row, so the good rows are kept and the bad rows
+        are reported. The whole batch is committed once at the end.
+
+        If the caller already has a transaction open, the batch runs inside a
+        SAVEPOINT of that transaction instead and is not committed: the caller
+        commits or rolls back its own transaction.
+        """
+        result = {"inserted": 0, "failed": []}
+        if not self._conn or not self._cursor:
+            print("Error: Database connection is not active.")
+            return result
+        rows = iter(rows)
+        row_index = 0
+        try:
+            #- BEGIN = one transaction for the whole batch, so there is only one commit (one fsync) at the end
+            opened = not self._conn.in_transaction
+            if opened:
+                self._cursor.execute("BEGIN")
+            else:
+                self._cursor.execute("SAVEPOINT bulk_batch")
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                #- SAVEPOINT = a point inside the transaction we can roll back to
+                self._cursor.execute("SAVEPOINT bulk_chunk")
+                try:
+                    self._cursor.executemany(query, chunk)
+                    result["inserted"] += len(chunk)
+                except sqlite3.IntegrityError:
+                    # Undo this chunk only, then find the bad rows one by one
+                    self._cursor.execute("ROLLBACK TO bulk_chunk")
+                    for offset, row in enumerate(chunk):
+                        try:
+                            self._cursor.execute(query, row)
+                            result["inserted"] += 1
+                        except sqlite3.IntegrityError as e:
+                            result["failed"].append({"row": row_index + offset, "values": tuple(row), "error": str(e)})
+                self._cursor.execute("RELEASE bulk_chunk")
+                row_index += len(chunk)
+            if opened:
+                self._conn.commit()
+            else:
+                self._cursor.execute("RELEASE bulk_batch")
+        except sqlite3.Error as e:
+            # Any other error cancels the whole batch, nothing is half inserted
+            if opened:
+                self._conn.rollback()
+            elif self._conn.in_transaction:
+                # Only undo this batch, the rest of the caller's transaction is kept
+                self._cursor.execute("ROLLBACK TO bulk_batch")
+                self._cursor.execute("RELEASE bulk_batch")
+            print(f"Database error: {e}. The whole batch was rolled back.")
+            result["inserted"] = 0
+            return result
+        print(f"✓ Inserted {result['inserted']} rows, {len(result['failed'])} failed.")
+        return result
+
     def _create_tables(self):
         """Creates Students, Teachers, and Courses tables if they do not exist."""
         # Create Students table
@@ -99,6 +395,124 @@ class YooBee:
         ''')
         print("✓ Tables created (if not already existing).")
 
+    def schema_version(self) -> int:
+        """Returns the schema version of the database (the number of applied migrations)."""
+        cursor_result = self._execute_query("PRAGMA user_version")
+        if cursor_result:
+            return cursor_result.fetchone()[0]
+        return 0
+
+    def _migrate(self):
+        """Applies the migrations the database does not have yet, each one in its own transaction."""
+        version = self.schema_version()
+        for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            if isinstance(statements, str):
+                # A data migration: the method commits its own batches, the version is saved when it is done
+                if not getattr(self, statements)():
+                    print(f"Schema migration {number} is not finished, it will resume next time.")
+                    return
+                statements = []
+            try:
+                if not self._conn.in_transaction:
+                    self._cursor.execute("BEGIN")
+                for statement in statements:
+                    self._cursor.execute(statement)
+                # In SQLite the version is saved with the schema change, or not at all
+                self._cursor.execute(f"PRAGMA user_version = {number}")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"Database error: {e}. Schema migration {number} was rolled back.")
+                self._print_course_name_conflicts(e)
+                return
+            print(f"✓ Applied schema migration {number}.")
+
+    def _migrate_enrollments(self, batch_size: int = MIGRATION_BATCH_SIZE) -> bool:
+        """
+        Moves the Courses rows to CourseCatalog and Enrollments, batch_size rows per transaction.
+
+        Every enrollment keeps the id of its Courses row, so the move always goes
+        on from the largest id already in Enrollments: if it is stopped, the next
+        run resumes where it stopped. Other connections can use the database
+        between two batches. A course code with two different names stops the
+        move (nothing is dropped), the conflicting codes are printed so they can be fixed.
+        """
+        moved = 0
+        try:
+            self._cursor.execute(CATALOG_NAME_CHECK_TRIGGER)
+            while True:
+                last_id = self._cursor.execute("SELECT COALESCE(MAX(id), 0) FROM Enrollments").fetchone()[0]
+                # The id of the last row of this batch
+                batch_end = self._cursor.execute(
+                    "SELECT MAX(id) FROM (SELECT id FROM Courses WHERE id > ? ORDER BY id LIMIT ?)",
+                    (last_id, batch_size)).fetchone()[0]
+                if batch_end is None:
+                    break
+                # Every course is added once, a second name for a code is stopped by catalog_name_check
+                self._cursor.execute("""
+                INSERT OR IGNORE INTO CourseCatalog (code, name)
+                SELECT code, name FROM Courses WHERE id > ? AND id <= ? ORDER BY id
+                """, (last_id, batch_end))
+                self._cursor.execute("""
+                INSERT INTO Enrollments (id, course_id, teacher_id, student_id)
+                SELECT C.id, CC.id, C.teacher_id, C.student_id
+                FROM Courses AS C JOIN CourseCatalog AS CC ON CC.code = C.code
+                WHERE C.id > ? AND C.id <= ? ORDER BY C.id
+                """, (last_id, batch_end))
+                batch_moved = self._cursor.rowcount
+                self._conn.commit()
+                moved += batch_moved
+        except sqlite3.Error as e:
+            self._conn.rollback()
+            print(f"Database error: {e}. {moved} enrollments were moved, the rest will be moved next time.")
+            self._print_course_name_conflicts(e)
+            return False
+        print(f"✓ Moved {moved} enrollments to the normalized schema.")
+        return True
+
+    def course_name_conflicts(self) -> dict:
+        """Returns the course codes that have more than one name, code -> list of names."""
+        cursor_result = self._execute_query("""
+        SELECT code, name FROM Courses UNION SELECT code, name FROM CourseCatalog ORDER BY code, name
+        """)
+        names = {}
+        if cursor_result:
+            for row in cursor_result.fetchall():
+                names.setdefault(row['code'], []).append(row['name'])
+        return {code: code_names for code, code_names in names.items() if len(code_names) > 1}
+
+    def _print_course_name_conflicts(self, error: sqlite3.Error) -> None:
+        """Prints the conflicting course names if a migration was stopped by catalog_name_check."""
+        if COURSE_NAME_CONFLICT not in str(error):
+            return
+        for code, names in self.course_name_conflicts().items():
+            print(f"Course {code} has {len(names)} names: {', '.join(map(repr, names))}. Give it one name to finish the migration.")
+
+    def _course_queries(self) -> tuple:
+        """Returns the (students count, teachers) queries for the schema of the database."""
+        if self._normalized:
+            return STUDENTS_COUNT_QUERY, TEACHERS_FOR_COURSE_QUERY
+        return LEGACY_STUDENTS_COUNT_QUERY, LEGACY_TEACHERS_FOR_COURSE_QUERY
+
+    def explain_query_plan(self, query: str, params=None) -> list:
+        """Returns the steps of EXPLAIN QUERY PLAN for a query, e.g. 'SEARCH C USING INDEX ...'."""
+        cursor_result = self._execute_query(f"EXPLAIN QUERY PLAN {query}", params)
+        if cursor_result:
+            return [row['detail'] for row in cursor_result.fetchall()]
+        return []
+
+    def check_query_plans(self) -> bool:
+        """Checks that the course queries use indexes instead of scanning a table."""
+        all_indexed = True
+        for name, query in zip(("get_students_count_for_course", "get_teachers_for_course"), self._course_queries()):
+            plan = self.explain_query_plan(query, ("MSE800",))
+            # A full scan shows as 'SCAN <table>', an index as 'SEARCH ... USING ... INDEX'
+            indexed = any("INDEX" in step for step in plan) and not any(
+                step.startswith("SCAN") and "INDEX" not in step for step in plan)
+            all_indexed = all_indexed and indexed
+            print(f"{'✓' if indexed else '✗'} {name}: {'; '.join(plan)}")
+        return all_indexed
+
     def insert_initial_data(self):
         """Inserts predefined initial data into the tables."""
         # Sample student data
@@ -117,6 +531,7 @@ class YooBee:
             VALUES (?, ?)
             ''', students_data)
             self._conn.commit()
+            self._invalidate("Students")
             print(f"✓ Inserted {len(students_data)} initial students.")
         else:
             print("Students table already has data, skipping initial student insert.")
@@ -137,6 +552,7 @@ class YooBee:
             VALUES (?, ?)
             ''', teachers_data)
             self._conn.commit()
+            self._invalidate("Teachers")
             print(f"✓ Inserted {len(teachers_data)} initial teachers.")
         else:
             print("Teachers table already has data, skipping initial teacher insert.")
@@ -158,6 +574,7 @@ class YooBee:
             VALUES (?, ?, ?, ?)
             ''', courses_data)
             self._conn.commit()
+            self._invalidate(*COURSES_TABLES)
             print(f"✓ Inserted {len(courses_data)} initial courses.")
         else:
             print("Courses table already has data, skipping initial course insert.")
@@ -166,45 +583,76 @@ class YooBee:
         """Adds a new student to the Students table."""
         query = "INSERT INTO Students (name, email) VALUES (?, ?)"
         result = self._execute_query(query, (name, email), commit=True)
+        self._invalidate("Students")
         return True if result else False # Return boolean based on whether cursor was returned
 
     def add_teacher(self, name: str, email: str) -> bool:
         """Adds a new teacher to the Teachers table."""
         query = "INSERT INTO Teachers (name, email) VALUES (?, ?)"
         result = self._execute_query(query, (name, email), commit=True)
+        self._invalidate("Teachers")
         return True if result else False # Return boolean based on whether cursor was returned
 
     def add_course(self, code: str, name: str, teacher_id: int, student_id: int) -> bool:
         """Adds a new course enrollment to the Courses table."""
         query = "INSERT INTO Courses (code, name, teacher_id, student_id) VALUES (?, ?, ?, ?)"
         result = self._execute_query(query, (code, name, teacher_id, student_id), commit=True)
+        self._invalidate(*COURSES_TABLES)
         return True if result else False # Return boolean based on whether cursor was returned
 
+    def add_students(self, students: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+        """Adds many students, (name, email) tuples, in one transaction. Returns {"inserted": int, "failed": list}."""
+        query = "INSERT INTO Students (name, email) VALUES (?, ?)"
+        result = self._bulk_insert(query, students, chunk_size)
+        self._invalidate("Students")
+        return result
+
+    def add_teachers(self, teachers: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+        """Adds many teachers, (name, email) tuples, in one transaction. Returns {"inserted": int, "failed": list}."""
+        query = "INSERT INTO Teachers (name, email) VALUES (?, ?)"
+        result = self._bulk_insert(query, teachers, chunk_size)
+        self._invalidate("Teachers")
+        return result
+
+    def add_courses(self, courses: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+        """Adds many course enrollments, (code, name, teacher_id, student_id) tuples, in one transaction."""
+        query = "INSERT INTO Courses (code, name, teacher_id, student_id) VALUES (?, ?, ?, ?)"
+        result = self._bulk_insert(query, courses, chunk_size)
+        self._invalidate(*COURSES_TABLES)
+        return result
+
     def get_students_count_for_course(self, course_code: str) -> int:
-        """Returns the number of students enrolled in a specific course."""
-        query = "SELECT COUNT(DISTINCT student_id) FROM Courses WHERE code=?"
+        """Returns the number of students enrolled in a specific course (cached until a write)."""
+        query = self._course_queries()[0]
+        cached = self._cache_get(query, (course_code,))
+        if cached is not _MISS:
+            return cached
         # Fetch one result, which is the count
         cursor_result = self._execute_query(query, (course_code,))
         if cursor_result:
-            return cursor_result.fetchone()[0]
+            count = cursor_result.fetchone()[0]
+            self._cache_put(query, (course_code,), count)
+            return count
         return 0
 
     def get_teachers_for_course(self, course_code: str) -> list:
         #- SELECT T.name: "I want to see the names from the Teachers table."
         #- FROM Teachers AS T: "Look in the Teachers table (let's call it T for short)."
-        #- JOIN Courses AS C ON T.id = C.teacher_id: "And also look in the Courses table (let's call it C), connecting them where the Teacher's ID in the Teachers table matches the teacher_id in the Courses table."
-        #- WHERE C.code = 'MSE802': "But only show me the teachers whose courses have the code 'MSE802'."
-        """Returns a list of teacher names teaching a specific course."""
-        query = """
-        SELECT DISTINCT T.name
-        FROM Teachers AS T
-        JOIN Courses AS C ON T.id = C.teacher_id
-        WHERE C.code = ?
-        """
+        #- JOIN Enrollments AS E ON T.id = E.teacher_id: "And also look in the Enrollments table (let's call it E), connecting them where the Teacher's ID in the Teachers table matches the teacher_id in the Enrollments table."
+        #- JOIN CourseCatalog AS CC ON CC.id = E.course_id: "Then find the course of every enrollment in the CourseCatalog table (CC)."
+        #- WHERE CC.code = 'MSE802': "But only show me the teachers whose courses have the code 'MSE802'."
+        """Returns a list of teacher names teaching a specific course (cached until a write)."""
+        query = self._course_queries()[1]
+        cached = self._cache_get(query, (course_code,))
+        if cached is not _MISS:
+            # A copy, so the caller can not change the cached list
+            return list(cached)
         cursor_result = self._execute_query(query, (course_code,))
         if cursor_result:
             # Fetch all matching teacher names and return as a list of strings
-            return [row['name'] for row in cursor_result.fetchall()]
+            teacher_names = [row['name'] for row in cursor_result.fetchall()]
+            self._cache_put(query, (course_code,), tuple(teacher_names))
+            return teacher_names
         return []
 
     def close(self):
@@ -233,7 +681,17 @@ if __name__ == "__main__":
         print('-'*30)
         print(f"Teachers for MSE802 are: {', '.join(mse802_teacher_names)}.")
         print('-'*30)
+        # Asking again is answered from the query result cache
+        db_manager.get_students_count_for_course('MSE800')
+        print(f"Query cache: {db_manager.cache_stats()}")
+        print('-'*30)
+        # Check that the course queries use the indexes of the schema migrations
+        print(f"Schema version: {db_manager.schema_version()}")
+        db_manager.check_query_plans()
+        print('-'*30)
         # Example of adding new data
         # db_manager.add_student('New Student', 'new@example.com')
         # db_manager.add_teacher('New Teacher', 'newteacher@example.com')
-        # db_manager.add_course('MSE803', 'Database Systems', 2, 4)
\ No newline at end of file
+        # db_manager.add_course('MSE803', 'Database Systems', 2, 4)
+        # Example of adding many rows in one transaction (a generator works too)
+        # db_manager.add_students((f'Student {i}', f'student{i}@example.com') for i in range(100000))
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Tests of the YooBee database class (code.py).
+@author: Yaohui Zhang @tomie
+
+Usage:
+    python -m pytest Week3Activity4
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+
+# code.py has the name of a standard library module, so it is loaded from its path
+_spec = importlib.util.spec_from_file_location("yoobee_code", os.path.join(os.path.dirname(__file__), "code.py"))
+yoobee_code = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(yoobee_code)
+
+
+class YooBeeTest(unittest.TestCase):
+    """Every test gets a new database with the initial data, in a temporary directory."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.db = yoobee_code.YooBee(os.path.join(self.directory.name, "test.db"))
+            self.db.insert_initial_data()
+
+    def tearDown(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.db.close()
+        self.directory.cleanup()
+
+    def test_course_with_another_name_is_rejected(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            added = self.db.add_course('MSE802', 'Totally different', 5, 5)
+        self.assertFalse(added)
+        self.assertEqual(self.db.course_name_conflicts(), {})
+        self.assertEqual(self.db.get_students_count_for_course('MSE802'), 3)
+
+    def test_course_with_the_same_name_is_added(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            added = self.db.add_course('MSE802', 'Quantum computing', 5, 5)
+        self.assertTrue(added)
+        self.assertEqual(self.db.get_students_count_for_course('MSE802'), 4)
+
+    def test_course_queries_use_indexes(self):
+        self.assertEqual(self.db.schema_version(), len(yoobee_code.MIGRATIONS))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.db.check_query_plans())
+        for query in (yoobee_code.STUDENTS_COUNT_QUERY, yoobee_code.TEACHERS_FOR_COURSE_QUERY):
+            plan = self.db.explain_query_plan(query, ("MSE800",))
+            full_scans = [step for step in plan if step.startswith("SCAN") and "INDEX" not in step]
+            self.assertEqual(full_scans, [], plan)
+
+    def test_missing_index_is_reported(self):
+        self.db._conn.execute("DROP INDEX idx_enrollments_course_student")
+        self.db._conn.execute("DROP INDEX idx_enrollments_course_teacher")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(self.db.check_query_plans())
+
+    def _students_count(self):
+        return self.db._conn.execute("SELECT COUNT(*) FROM Students").fetchone()[0]
+
+    def test_bulk_insert_commits_its_own_transaction(self):
+        before = self._students_count()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.db.add_students([("Ana", "ana@example.com"), ("Ben", "ben@example.com")])
+        self.assertEqual(result["inserted"], 2)
+        self.assertFalse(self.db._conn.in_transaction)
+        self.assertEqual(self._students_count(), before + 2)
+
+    def test_bulk_insert_leaves_the_callers_transaction_open(self):
+        before = self._students_count()
+        self.db._conn.execute("BEGIN")
+        self.db._conn.execute("INSERT INTO Students (name, email) VALUES ('Cal', 'cal@example.com')")
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.db.add_students([("Ana", "ana@example.com"), ("Ana again", "ana@example.com")])
+        self.assertEqual(result["inserted"], 1)
+        self.assertEqual(len(result["failed"]), 1)
+        self.assertTrue(self.db._conn.in_transaction)
+        self.assertEqual(self._students_count(), before + 2)
+        # The caller decides: rolling back undoes its own row and the batch
+        self.db._conn.rollback()
+        self.assertEqual(self._students_count(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+This file is used to build an inverted word index of a text file, so words and
+phrases can be found without scanning the text again.
+@author: Yaohui Zhang @tomie
+"""
+
+import codecs
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+# A word is a run of letters, digits or underscores, any case
+WORD_PATTERN = re.compile(r"\w+")
+# Number of bytes read at a time when the index is built (1 MB)
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def tokenize(text):
+    """
+    Split text into lower case words.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        list: The words, in order
+    """
+    return WORD_PATTERN.findall(text.lower())
+
+
+class WordIndex:
+    """
+    An inverted index of a text file: for every word, the positions where it is
+    (position 0 is the first word of the file, 1 the second, ...).
+
+    All the positions are stored in one compact uint32 numpy array, grouped by
+    word, and every word points to its own slice of it. The index is saved next
+    to the file as <file>.words with the size and mtime of the file, and built
+    again when the file changes.
+    """
+    def __init__(self, file_path):
+        """
+        Initialize the index of a file, loading the saved index if it is up to date.
+
+        Args:
+            file_path (str): Path to the text file
+        """
+        self.file_path = file_path
+        self.index_path = f"{file_path}.words"
+        # word -> (first position in self.positions, number of positions)
+        self.terms = {}
+        self.positions = np.empty(0, dtype=np.uint32)
+        self.word_count = 0
+        # (size, mtime) of the file the index was made from
+        self.stamp = None
+        if not self._load():
+            self.build()
+
+    def _stamp(self):
+        """Return the (size, mtime) of the file, to know if the saved index is still valid."""
+        stat = os.stat(self.file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def is_current(self):
+        """Return True if the file has not changed since the index was made."""
+        return self.stamp == self._stamp()
+
+    def _read_words(self):
+        """
+        Read the words of the file chunk by chunk.
+
+        A word cut at the end of a chunk is kept and joined with the next chunk.
+
+        Yields:
+            list: The words of one chunk
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        carry = ""
+        with open(self.file_path, 'rb') as f:
+            while True:
+                data = f.read(READ_CHUNK_SIZE)
+                text = carry + decoder.decode(data, final=not data)
+                if not data:
+                    yield tokenize(text)
+                    return
+                # Keep the last word, it may continue in the next chunk
+                last_word = None
+                for last_word in WORD_PATTERN.finditer(text):
+                    pass
+                cut = last_word.start() if last_word and last_word.end() == len(text) else len(text)
+                carry = text[cut:]
+                yield tokenize(text[:cut])
+
+    def build(self):
+        """
+        Tokenize the file once, build the index and save it.
+
+        Returns:
+            WordIndex: The index itself
+        """
+        self.stamp = self._stamp()
+        postings = {}
+        position = 0
+        for words in self._read_words():
+            for word in words:
+                postings.setdefault(word, []).append(position)
+                position += 1
+        self.word_count = position
+        self.terms = {}
+        start = 0
+        for word, word_positions in postings.items():
+            self.terms[word] = (start, len(word_positions))
+            start += len(word_positions)
+        self.positions = np.fromiter((p for word_positions in postings.values() for p in word_positions),
+                                     dtype=np.uint32, count=start)
+        self.save()
+        return self
+
+    def save(self):
+        """
+        Save the index: an 8 byte header length, a JSON header and the positions array.
+        """
+        header = json.dumps({
+            "stamp": self.stamp,
+            "word_count": self.word_count,
+            "terms": self.terms,
+        }).encode('utf-8')
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, 'wb') as f:
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(self.positions.astype("<u4").tobytes())
+        os.replace(temporary_path, self.index_path)
+
+    def _load(self):
+        """
+        Load the saved index if it was made from the current file.
+
+        Returns:
+            bool: True if the index was loaded
+        """
+        try:
+            with open(self.index_path, 'rb') as f:
+                header_size = struct.unpack("<Q", f.read(8))[0]
+                header = json.loads(f.read(header_size).decode('utf-8'))
+                if header["stamp"] != self._stamp():
+                    return False
+                self.positions = np.frombuffer(f.read(), dtype="<u4")
+        except (FileNotFoundError, ValueError, KeyError, struct.error):
+            return False
+        self.stamp = header["stamp"]
+        self.word_count = header["word_count"]
+        self.terms = {word: tuple(entry) for word, entry in header["terms"].items()}
+        return True
+
+    def lookup(self, word):
+        """
+        Return the positions of one word (any case).
+
+        Args:
+            word (str): The word
+
+        Returns:
+            numpy.ndarray: The sorted positions, a view of the index (no copy)
+        """
+        start, count = self.terms.get(word.lower(), (0, 0))
+        return self.positions[start:start + count]
+
+    def search(self, query):
+        """
+        Find a word or a phrase (words next to each other, in order).
+
+        Args:
+            query (str): One or more words, e.g. "Baba Yaga"
+
+        Returns:
+            numpy.ndarray: The positions of the first word of every match
+        """
+        words = tokenize(query)
+        if not words:
+            return np.empty(0, dtype=np.uint32)
+        matches = self.lookup(words[0])
+        # Keep the matches where word i of the phrase is at position + i
+        for offset, word in enumerate(words[1:], start=1):
+            if len(matches) == 0:
+                break
+            following = self.lookup(word)
+            matches = matches[np.isin(matches + offset, following, assume_unique=True)]
+        return matches